@@ -4,26 +4,60 @@ from kivy.properties import StringProperty, DictProperty, ListProperty, NumericP
 from kivy.uix.popup import Popup
 from kivy.uix.label import Label
 from kivy.core.window import Window
+from kivy.clock import Clock
 from kivy.uix.widget import Widget
 from kivy.graphics.texture import Texture
 from kivy.uix.button import Button
-from kivy.uix.modalview import ModalView
+from bisect import bisect_left
+from collections import OrderedDict
+from storage import UserWorkoutRepository
+
+# Barevné zastávky gradientu: (pozice 0..1, (r, g, b, a))
+GRADIENT_STOPS = ((0.0, (10, 60, 30, 255)), (1.0, (41, 186, 93, 255)))
+GRADIENT_CACHE_SIZE = 16
+_gradient_cache = OrderedDict()
+
+
+def gradient_buffer(height, stops):
+    """RGBA buffer 1 x height s lineární interpolací mezi zastávkami, jeden souvislý bytearray."""
+    positions = [p for p, _ in stops]
+    buf = bytearray(height * 4)
+    for y in range(height):
+        # Úsek gradientu a poměr v něm stačí spočítat jednou na řádek
+        t = y / (height - 1) if height > 1 else 0.0
+        i = min(max(bisect_left(positions, t), 1), len(stops) - 1)
+        (p0, c0), (p1, c1) = stops[i - 1], stops[i]
+        k = (t - p0) / (p1 - p0) if p1 > p0 else 0.0
+        k = min(max(k, 0.0), 1.0)
+        buf[y * 4:y * 4 + 4] = bytes(int(a + (b - a) * k + 0.5) for a, b in zip(c0, c1))
+    return bytes(buf)
+
+
+def gradient_texture(height=64, stops=GRADIENT_STOPS):
+    """Sdílená textura gradientu; stejná velikost a zastávky = stejná textura na GPU."""
+    key = (height, tuple((p, tuple(c)) for p, c in stops))
+    texture = _gradient_cache.get(key)
+    if texture is not None:
+        _gradient_cache.move_to_end(key)
+        return texture
+    texture = Texture.create(size=(1, height), colorfmt='rgba')
+    texture.blit_buffer(gradient_buffer(height, key[1]), colorfmt='rgba', bufferfmt='ubyte')
+    texture.wrap = 'repeat'
+    texture.uvsize = (1, -1)
+    _gradient_cache[key] = texture
+    if len(_gradient_cache) > GRADIENT_CACHE_SIZE:
+        _gradient_cache.popitem(last=False)
+    return texture
+
 
 class GradientBackground(Widget):
     gradient_texture = ObjectProperty(None)
-    
+    gradient_height = NumericProperty(64)
+    gradient_stops = ObjectProperty(GRADIENT_STOPS)
+
     def create_gradient_texture(self):
-        texture = Texture.create(size=(1, 64), colorfmt='rgba')
-        buf = bytes()
-        for i in range(64):
-            r = int(10 + i * 0.5)
-            g = int(60 + i * 2)
-            b = int(30 + i * 1)
-            buf += bytes([r, g, b, 255])
-        texture.blit_buffer(buf, colorfmt='rgba', bufferfmt='ubyte')
-        texture.wrap = 'repeat'
-        texture.uvsize = (1, -1)
-        return texture
+        # Textura se táhne přes celou plochu, změna velikosti widgetu ji nemění
+        return gradient_texture(int(self.gradient_height), self.gradient_stops)
 
 # Nastavení velikosti a základní barvy okna
 Window.size = (1200, 700)
@@ -32,6 +66,18 @@ Window.minimum_width = 800
 Window.minimum_height = 600
 
 
+def sync_rows(rv, texts):
+    """Srovná data RecycleView se seznamem textů; přepíše jen řádky, které se liší."""
+    data = rv.data
+    for i, text in enumerate(texts):
+        if i >= len(data):
+            data.append({"text": text})
+        elif data[i]["text"] != text:
+            data[i] = {"text": text}
+    if len(data) > len(texts):
+        del data[len(texts):]
+
+
 # ======== OBRAZOVKY ========
 
 class MainScreen(Screen):
@@ -58,13 +104,14 @@ class MainScreen(Screen):
     def logout(self):
         if self.workouts_screen:
             # Save any remaining data before logout
-            self.workouts_screen.save_to_file(
-                "\n".join([f"{ex} - {s}x{r}, {w}kg" for ex, s, r, w in self.workouts_screen.workout_data]),
-                self.workouts_screen.ids.note.text
-            )
+            if self.workouts_screen.workout_data:
+                self.workouts_screen.save_to_file(
+                    "\n".join([f"{ex} - {s}x{r}, {w}kg" for ex, s, r, w in self.workouts_screen.workout_data]),
+                    self.workouts_screen.ids.note.text
+                )
             # Reset workout data
             self.workouts_screen.workout_data = []
-            self.workouts_screen.ids.workout_list.text = ""
+            self.workouts_screen.ids.workout_list.data = []
             self.workouts_screen.ids.note.text = ""
             
         self.manager.current = "login"
@@ -98,6 +145,15 @@ class LoginScreen(Screen):
 
 
 
+class ExerciseRow(Button):
+    """Řádek výběru cviku; RecycleView ho znovu používá pro různé cviky."""
+    screen = ObjectProperty(None, allownone=True)
+
+    def on_release(self):
+        if self.screen:
+            self.screen.select_exercise(self.text)
+
+
 class WorkoutsScreen(Screen):
     exercises = ListProperty(["Bench press", "Dřepy", "Mrtvý tah", "Biceps curl", "Kliky"])
     workout_data = ListProperty()
@@ -106,57 +162,59 @@ class WorkoutsScreen(Screen):
     selected_exercise = StringProperty("")
     show_exercises = BooleanProperty(False)
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.repository = UserWorkoutRepository()
+        # Seřazený index (casefold, název) pro hledání podle prefixu
+        self._exercise_keys = []
+        self._exercise_names = []
+        # Víc změn seznamu během jednoho snímku -> jedna aktualizace
+        self._exercise_trigger = Clock.create_trigger(lambda _dt: self.update_exercise_list())
+        self._exercise_trigger()
+
     def load_user_data(self, username):
-        """Load saved data for the user from JSON file."""
-        import json
-        import os
-        
-        if os.path.exists("data/users.json"):
-            try:
-                with open("data/users.json", "r") as f:
-                    data = json.load(f)
-                    if username in data:
-                        user_data = data[username]
-                        self.personal_records.update(user_data.get("personal_records", {}))
-                        self.progress_data.update(user_data.get("progress_data", {}))
-                        
-                        # Update exercises list with any custom exercises
-                        custom_exercises = set()
-                        for workout in user_data.get("workouts", []):
-                            for ex, _, _, _ in workout["exercises"]:
-                                custom_exercises.add(ex)
-                        
-                        # Add any new exercises to the list
-                        for exercise in custom_exercises:
-                            if exercise not in self.exercises:
-                                self.exercises.append(exercise)
-            except (json.JSONDecodeError, KeyError):
-                pass  # Use default data if file is corrupted or empty
+        """Load saved data for the user from the repository."""
+        # Čte se jen hlavička uživatele; těla tréninků zůstávají na disku
+        self.apply_index(self.repository.load_index(username))
+
+    def apply_index(self, index):
+        self.personal_records.update(index["personal_records"])
+        self.progress_data.update(index["progress"])
+
+        # Add any new exercises to the list
+        new_exercises = [ex for ex in index["exercises"] if ex not in self.exercises]
+        if new_exercises:
+            self.exercises.extend(new_exercises)
 
     def on_exercises(self, instance, value):
-        self.update_exercise_list()
+        self._exercise_trigger()
 
     def update_exercise_list(self):
+        """Přestaví index cviků a zobrazí seznam podle aktuálního hledání."""
+        index = sorted((exercise.casefold(), exercise) for exercise in self.exercises)
+        self._exercise_keys = [key for key, _ in index]
+        self._exercise_names = [name for _, name in index]
+        search = self.ids.get('exercise_search', None)
+        self.filter_exercises(search.text if search else "")
+
+    def filter_exercises(self, query):
         exercise_list = self.ids.get('exercise_list', None)
-        if exercise_list:
-            exercise_list.clear_widgets()
-            for exercise in self.exercises:
-                btn = Button(
-                    text=exercise,
-                    size_hint_y=None,
-                    height=48,
-                    background_color=(0.2, 0.2, 0.2, 1)
-                )
-                btn.bind(on_release=lambda b: self.select_exercise(b.text))
-                exercise_list.add_widget(btn)
+        if not exercise_list:
+            return
+        query = query.strip().casefold()
+        if query:
+            # Binární hledání v seřazeném indexu: O(log n + počet shod)
+            lo = bisect_left(self._exercise_keys, query)
+            hi = bisect_left(self._exercise_keys, query + "\U0010ffff")
+            names = self._exercise_names[lo:hi]
+        else:
+            names = self.exercises
+        exercise_list.data = [{"text": name, "screen": self} for name in names]
 
     def toggle_exercise_list(self):
         """Show or hide the right-side exercise panel."""
         # Toggle flag; kv bindings handle visibility/disabled state
         self.show_exercises = not self.show_exercises
-        if self.show_exercises:
-            # populate list when opening
-            self.update_exercise_list()
 
     def select_exercise(self, exercise_name):
         self.selected_exercise = exercise_name
@@ -187,7 +245,7 @@ class WorkoutsScreen(Screen):
 
         entry = f"{self.selected_exercise} - {sets}x{reps}, {weight}kg"
         self.workout_data.append((self.selected_exercise, int(sets), int(reps), int(weight)))
-        self.ids.workout_list.text += f"{entry}\n"
+        self.ids.workout_list.data.append({"text": entry})
 
         # aktualizace osobních rekordů
         if self.selected_exercise not in self.personal_records or int(weight) > self.personal_records[self.selected_exercise]:
@@ -203,8 +261,7 @@ class WorkoutsScreen(Screen):
     def remove_last(self):
         if self.workout_data:
             self.workout_data.pop()
-            lines = self.ids.workout_list.text.strip().split("\n")
-            self.ids.workout_list.text = "\n".join(lines[:-1])
+            self.ids.workout_list.data.pop()
         else:
             popup = Popup(title="Chyba",
                           content=Label(text="Žádné cviky k odstranění."),
@@ -222,21 +279,7 @@ class WorkoutsScreen(Screen):
         note = self.ids.note.text
         summary = "\n".join([f"{ex} - {s}x{r}, {w}kg" for ex, s, r, w in self.workout_data])
 
-        # Update progress data
-        from datetime import datetime
-        date = datetime.now().strftime("%Y-%m-%d")
-        for exercise, sets, reps, weight in self.workout_data:
-            if exercise not in self.progress_data:
-                self.progress_data[exercise] = []
-            self.progress_data[exercise].append({
-                'date': date,
-                'sets': sets,
-                'reps': reps,
-                'weight': weight,
-                'volume': sets * reps * weight
-            })
-
-        # tady později přidáme ukládání do databáze
+        # Uloží trénink; progres a PR přepočítá úložiště
         self.save_to_file(summary, note)
 
         popup = Popup(
@@ -249,51 +292,23 @@ class WorkoutsScreen(Screen):
 
         # reset polí
         self.workout_data = []
-        self.ids.workout_list.text = ""
+        self.ids.workout_list.data = []
         self.ids.note.text = ""
 
     def save_to_file(self, summary, note):
-        """Saves workout data, personal records and progress to JSON file."""
-        import json
-        import os
+        """Připíše trénink do úložiště a obnoví progres a PR z uložených dat."""
         from datetime import datetime
 
-        # Ensure data directory exists
-        os.makedirs("data", exist_ok=True)
-        
-        # Load existing data
-        data = {}
-        if os.path.exists("data/users.json"):
-            try:
-                with open("data/users.json", "r") as f:
-                    data = json.load(f)
-            except json.JSONDecodeError:
-                data = {}
-        
         # Get current user
         username = App.get_running_app().root.get_screen("main").username
-        if username not in data:
-            data[username] = {
-                "workouts": [],
-                "personal_records": {},
-                "progress_data": {}
-            }
-        
-        # Update user data
+
         workout_entry = {
             "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "exercises": self.workout_data,
+            "exercises": [list(ex) for ex in self.workout_data],
             "note": note,
             "summary": summary
         }
-        
-        data[username]["workouts"].append(workout_entry)
-        data[username]["personal_records"] = dict(self.personal_records)
-        data[username]["progress_data"] = dict(self.progress_data)
-        
-        # Save updated data
-        with open("data/users.json", "w") as f:
-            json.dump(data, f, indent=4)
+        self.apply_index(self.repository.add_workout(username, workout_entry))
 
     def back_to_dashboard(self, *_):
         """Vrátí uživatele zpět na hlavní obrazovku."""
@@ -318,38 +333,54 @@ class StatsScreen(Screen):
             popup = Popup(title="Chyba", content=Label(text="Zadej číslo!"), size_hint=(0.5, 0.3))
             popup.open()
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._source = None
+        # Víc změn za jeden snímek (např. načtení progresu) -> jedno překreslení
+        self._refresh_trigger = Clock.create_trigger(lambda _dt: self.refresh())
+
     def on_enter(self):
         # Find the WorkoutsScreen instance inside the MainScreen
-        main_screen = App.get_running_app().root.get_screen('main')
-        for widget in main_screen.walk():
-            if isinstance(widget, WorkoutsScreen):
-                self.personal_records = widget.personal_records
-                self.progress_data = widget.progress_data
-                break
-        
-        # Update PR display
-        self.ids.pr_label.text = ""
+        if self._source is None:
+            main_screen = App.get_running_app().root.get_screen('main')
+            for widget in main_screen.walk():
+                if isinstance(widget, WorkoutsScreen):
+                    self._source = widget
+                    # Statistiky sledují data průběžně, ne jen při přepnutí obrazovky
+                    widget.bind(personal_records=lambda *_: self._refresh_trigger(),
+                                progress_data=lambda *_: self._refresh_trigger())
+                    break
+        self.refresh()
+
+    def refresh(self):
+        """Přepočítá řádky PR a progresu; překreslí se jen ty, které se změnily."""
+        if self._source is None:
+            return
+        self.personal_records = self._source.personal_records
+        self.progress_data = self._source.progress_data
+
         if self.personal_records:
-            for ex, w in self.personal_records.items():
-                self.ids.pr_label.text += f"{ex}: {w} kg\n"
+            records = [f"{ex}: {w} kg" for ex, w in self.personal_records.items()]
         else:
-            self.ids.pr_label.text = "(zatím žádné PR)"
+            records = ["(zatím žádné PR)"]
+        sync_rows(self.ids.pr_list, records)
 
-        # Update progress display
-        self.ids.progress_label.text = ""
+        rows = []
         if self.progress_data:
             for exercise, data in self.progress_data.items():
-                latest = data[-1]
-                first = data[0]
+                latest = data['latest']
+                first = data['first']
                 progress = latest['weight'] - first['weight']
                 progress_text = "🔺" if progress > 0 else "🔻" if progress < 0 else "="
-                
-                self.ids.progress_label.text += f"\n{exercise}:\n"
-                self.ids.progress_label.text += f"  Poslední trénink: {latest['sets']}x{latest['reps']} @ {latest['weight']}kg\n"
-                self.ids.progress_label.text += f"  Progress: {abs(progress)}kg {progress_text}\n"
-                self.ids.progress_label.text += f"  Celkový objem: {latest['volume']}kg\n"
+                rows.append(
+                    f"{exercise}:\n"
+                    f"  Poslední trénink: {latest['sets']}x{latest['reps']} @ {latest['weight']}kg\n"
+                    f"  Progress: {abs(progress)}kg {progress_text}\n"
+                    f"  Celkový objem: {latest['volume']}kg"
+                )
         else:
-            self.ids.progress_label.text = "(zatím žádný progress)"
+            rows.append("(zatím žádný progress)")
+        sync_rows(self.ids.progress_list, rows)
 
 
 # ======== APLIKACE ========
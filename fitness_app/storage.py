@@ -0,0 +1,175 @@
+"""Ukládání tréninků pro lokální (standalone) aplikaci.
+
+Každý uživatel má vlastní adresář `data/users/<jméno>/`:
+
+- `index.json` - malá hlavička (cviky, PR, první/poslední trénink cviku,
+  počty), přepisuje se atomicky (dočasný soubor + rename)
+- `workouts.jsonl` - těla tréninků, jen se připisují (hlavička se z nich dá přepočítat)
+
+Přihlášení tak čte jen hlavičku jednoho uživatele bez ohledu na to, kolik
+uživatelů a tréninků v datech je.
+"""
+import json
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from urllib.parse import quote
+
+
+DATA_DIR = "data"
+
+
+def empty_index():
+    return {"last_seq": 0, "size": 0, "workout_count": 0, "exercises": [],
+            "personal_records": {}, "progress": {}}
+
+
+def apply_to_index(index, workout):
+    """Započítá trénink do hlavičky (PR, cviky, první/poslední výkon cviku)."""
+    index["workout_count"] += 1
+    date = workout["date"][:10]
+    for exercise, sets, reps, weight in workout["exercises"]:
+        records = index["personal_records"]
+        if exercise not in records or weight > records[exercise]:
+            records[exercise] = weight
+        if exercise not in index["exercises"]:
+            index["exercises"].append(exercise)
+        entry = {'date': date, 'sets': sets, 'reps': reps, 'weight': weight, 'volume': sets * reps * weight}
+        progress = index["progress"].get(exercise)
+        if progress is None:
+            index["progress"][exercise] = {"first": entry, "latest": entry, "entries": 1}
+        else:
+            progress["latest"] = entry
+            progress["entries"] += 1
+
+
+def write_atomic(path, data):
+    """Zapíše JSON do dočasného souboru a přejmenuje ho; po pádu zůstane starý nebo nový soubor, nikdy rozepsaný."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class WorkoutRepository(ABC):
+    """Rozhraní úložiště, které používá UI."""
+
+    @abstractmethod
+    def load_index(self, username):
+        """Vrátí hlavičku uživatele {workout_count, exercises, personal_records, progress}."""
+
+    @abstractmethod
+    def add_workout(self, username, workout):
+        """Uloží jeden trénink {date, exercises, note, summary} a vrátí novou hlavičku."""
+
+
+class UserWorkoutRepository(WorkoutRepository):
+    """Data rozdělená po uživatelích: hlavička index.json + těla workouts.jsonl.
+
+    Hlavička si pamatuje, kolik bajtů z workouts.jsonl už obsahuje (`size`).
+    Když pád nastane mezi připsáním těla a zápisem hlavičky, při načtení se
+    dočte jen chybějící konec souboru.
+    """
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        self.users_dir = os.path.join(data_dir, "users")
+        self._indexes = {}
+        self._migrate_legacy()
+
+    def _user_dir(self, username):
+        # Jméno uživatele jako bezpečný název adresáře (žádné "/" ani "..")
+        return os.path.join(self.users_dir, quote(username, safe="").replace(".", "%2E"))
+
+    def _migrate_legacy(self):
+        """Jednorázově rozdělí původní společný users.json ({jméno: {"workouts": [...]}}) po uživatelích."""
+        legacy_path = os.path.join(self.data_dir, "users.json")
+        # users.json zůstává beze změny (v repozitáři je jako ukázková data);
+        # dokončený převod označí značka v data/users/
+        marker = os.path.join(self.users_dir, ".legacy_migrated")
+        if not os.path.exists(legacy_path) or os.path.exists(marker):
+            return
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return  # poškozený soubor necháme být, ať se dá obnovit ručně
+        for username, user in legacy.items():
+            if os.path.exists(self._user_dir(username)):
+                continue  # převod přerušený pádem, tento uživatel už hotový je
+            user_dir = self._user_dir(username)
+            tmp_dir = user_dir + ".tmp"
+            os.makedirs(tmp_dir, exist_ok=True)
+            index = empty_index()
+            with open(os.path.join(tmp_dir, "workouts.jsonl"), "w", encoding="utf-8") as f:
+                for workout in user.get("workouts", []):
+                    index["last_seq"] += 1
+                    f.write(json.dumps({"seq": index["last_seq"], "workout": workout}, ensure_ascii=False) + "\n")
+                    apply_to_index(index, workout)
+                index["size"] = f.tell()
+            write_atomic(os.path.join(tmp_dir, "index.json"), index)
+            os.replace(tmp_dir, user_dir)
+        os.makedirs(self.users_dir, exist_ok=True)
+        with open(marker, "w", encoding="utf-8"):
+            pass
+
+    def load_index(self, username):
+        if username in self._indexes:
+            return self._indexes[username]
+        user_dir = self._user_dir(username)
+        index = empty_index()
+        try:
+            with open(os.path.join(user_dir, "index.json"), "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            index = empty_index()  # poškozená hlavička -> přepočítat z těl
+
+        # Dočíst tréninky připsané po posledním zápisu hlavičky
+        bodies = os.path.join(user_dir, "workouts.jsonl")
+        if os.path.exists(bodies) and os.path.getsize(bodies) > index["size"]:
+            with open(bodies, "rb") as f:
+                f.seek(index["size"])
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # neúplný poslední řádek po pádu
+                    index["size"] += len(line)
+                    if record["seq"] <= index["last_seq"]:
+                        continue
+                    index["last_seq"] = record["seq"]
+                    apply_to_index(index, record["workout"])
+            write_atomic(os.path.join(user_dir, "index.json"), index)
+
+        self._indexes[username] = index
+        return index
+
+    def add_workout(self, username, workout):
+        index = self.load_index(username)
+        user_dir = self._user_dir(username)
+        os.makedirs(user_dir, exist_ok=True)
+        record = {"seq": index["last_seq"] + 1, "workout": workout}
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(os.path.join(user_dir, "workouts.jsonl"), "ab") as f:
+            f.truncate(index["size"])  # zahodit případný neúplný řádek po pádu
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        index["last_seq"] = record["seq"]
+        index["size"] += len(line)
+        apply_to_index(index, workout)
+        # Hlavička je malá (jen souhrny), její přepis nezávisí na délce historie
+        write_atomic(os.path.join(user_dir, "index.json"), index)
+        return index
@@ -1,11 +1,29 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
-import bcrypt
 import jwt
 import datetime
 import sqlite3
-from db import get_db_connection, init_db
-from config import SECRET_KEY, CORS_ORIGINS
+import csv
+import io
+import json
+import logging
+import math
+import zlib
+from functools import wraps
+import compression
+import db
+import jsonprovider
+import logs
+import metrics
+from auth import require_auth, token_cache
+from passwords import PasswordPoolBusy, hasher
+from db import get_db, init_db, writer
+from config import SECRET_KEY, CORS_ORIGINS, FLASK_DEBUG, SERVER_PORT, WORKOUTS_PAGE_SIZE, WORKOUTS_MAX_PAGE_SIZE, EXPORT_CHUNK_SIZE, MAX_BATCH_WORKOUTS
+from config import MAX_SETS, MAX_REPS, MAX_WEIGHT, MAX_EXERCISE_LENGTH, MAX_NOTE_LENGTH
+
+# Logy jdou přes frontu do souboru logs/backend.log (JSON řádky)
+logs.setup_logging()
+log = logging.getLogger(__name__)
 
 app = Flask(__name__)
 # CORS: explicitně povolíme metody a hlavičky používané webem
@@ -14,21 +32,55 @@ CORS(
     resources={r"/*": {"origins": CORS_ORIGINS}},
     supports_credentials=False,
     methods=["GET", "POST", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization"],
+    allow_headers=["Content-Type", "Authorization", "If-None-Match", "X-Request-ID"],
+    expose_headers=["ETag", "Last-Modified", "X-Request-ID"],
 )
 app.config['SECRET_KEY'] = SECRET_KEY
+# Rychlejší serializace JSON (orjson, pokud je k dispozici)
+jsonprovider.init_app(app)
+# X-Request-ID a access log; registruje se první -> jeho after_request vidí výslednou odpověď
+logs.init_app(app)
+# Spojení z poolu se po každém requestu vrací zpět (teardown)
+db.init_app(app)
+# Počty a latence requestů po routách
+metrics.init_app(app)
+# gzip/brotli pro velké odpovědi; registruje se po metrikách -> after_request proběhne dřív
+compression.init_app(app)
+metrics.register_stats("fitness_db_pool", "Stav poolu SQLite spojení", db.pool_stats)
+metrics.register_stats("fitness_db_writer", "Stav zapisovací fronty", db.writer_stats)
+metrics.register_stats("fitness_token_cache", "Cache ověřených tokenů", token_cache.stats)
+metrics.register_stats("fitness_passwords", "Pool pro bcrypt", hasher.stats)
+metrics.register_stats("fitness_compression", "Komprimované odpovědi", compression.stats)
 
 # Inicializace databáze při startu
 with app.app_context():
     try:
         init_db()
-    except Exception as err:
-        print(f"Chyba při inicializaci databáze: {err}")
+    except Exception:
+        log.exception("Chyba při inicializaci databáze")
+
 
 # 🔎 Základní healthcheck
 @app.route('/ping', methods=['GET'])
 def ping():
-    return jsonify({"status": "ok"}), 200
+    return jsonify({"status": "ok", "db_pool": db.pool_stats(), "db_writer": db.writer_stats(),
+                    "token_cache": token_cache.stats(), "passwords": hasher.stats(),
+                    "json": jsonprovider.provider_name(app), "compression": compression.stats()}), 200
+
+
+# 📊 Metriky pro Prometheus
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype=None, content_type=metrics.CONTENT_TYPE)
+
+
+# Přetížený pool pro hashování hesel -> 503, ať login/registrace nezahltí ostatní requesty
+@app.errorhandler(PasswordPoolBusy)
+def password_pool_busy(_err):
+    response = jsonify({"error": "Server je přetížen, zkuste to prosím za chvíli"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
 
 # 🧩 Registrace
 @app.route('/register', methods=['POST'])
@@ -41,19 +93,24 @@ def register():
     if not username or not password:
         return jsonify({"error": "Chybí uživatelské jméno nebo heslo"}), 400
 
-    conn = get_db_connection()
+    conn = get_db()
     cur = conn.cursor()
 
     cur.execute("SELECT id FROM users WHERE username=?", (username,))
     if cur.fetchone() is not None:
         return jsonify({"error": "Uživatel už existuje"}), 400
 
-    hashed_pw = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-    cur.execute("INSERT INTO users (username, password_hash, email) VALUES (?, ?, ?)", (username, hashed_pw, email))
-    conn.commit()
-
     cur.close()
-    conn.close()
+
+    hashed_pw = hasher.hash(password)
+    try:
+        writer.submit(lambda c: c.execute(
+            "INSERT INTO users (username, password_hash, email) VALUES (?, ?, ?)",
+            (username, hashed_pw, email)
+        ).lastrowid)
+    except sqlite3.IntegrityError:
+        # Souběžná registrace stejného jména
+        return jsonify({"error": "Uživatel už existuje"}), 400
 
     return jsonify({"message": "Účet úspěšně vytvořen!"}), 201
 
@@ -65,21 +122,28 @@ def login():
     username = data.get("username")
     password = data.get("password")
 
-    conn = get_db_connection()
+    conn = get_db()
     cur = conn.cursor()
     cur.execute("SELECT id, username, password_hash FROM users WHERE username=?", (username,))
     row = cur.fetchone()
     cur.close()
-    conn.close()
 
     if not row:
         return jsonify({"error": "Neplatné jméno nebo heslo"}), 401
 
     user = {"id": row[0], "username": row[1], "password_hash": row[2]}
     # password_hash je uložen jako BLOB (bytes)
-    if not bcrypt.checkpw(password.encode('utf-8'), user['password_hash']):
+    if not hasher.check(password, user['password_hash']):
         return jsonify({"error": "Neplatné jméno nebo heslo"}), 401
 
+    # Změnila se cena bcryptu v config.py -> heslo známe, tak hash rovnou přepočítáme
+    if hasher.needs_rehash(user['password_hash']):
+        new_hash = hasher.hash(password)
+        writer.submit(lambda c: c.execute(
+            "UPDATE users SET password_hash=? WHERE id=?", (new_hash, user["id"])
+        ).rowcount)
+        hasher.count_rehash()
+
     token = jwt.encode({
         "user_id": user["id"],
         "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=12)
@@ -88,85 +152,439 @@ def login():
     return jsonify({"token": token})
 
 
-# 🏋️‍♂️ Přidání tréninku
-@app.route('/add_workout', methods=['POST'])
-def add_workout():
-    data = request.get_json()
-    token = data.get("token")
+# Duplicitní client_key (opakované odeslání téže série) se tiše přeskočí
+INSERT_WORKOUT_SQL = (
+    "INSERT INTO workouts (user_id, exercise, sets, reps, weight, note, date, client_key)"
+    " VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?)"
+    " ON CONFLICT DO NOTHING"
+)
 
-    try:
-        decoded = jwt.decode(token, app.config['SECRET_KEY'], algorithms=["HS256"])
-        user_id = decoded["user_id"]
-    except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Token vypršel"}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Neplatný token"}), 401
+
+def insert_workouts(cur, rows):
+    """Vloží tréninky a ve stejné transakci je započítá do user_exercise_summary.
+
+    Vrací počet skutečně vložených řádků (bez duplicit podle client_key).
+    """
+    since_id = cur.execute("SELECT COALESCE(MAX(id), 0) FROM workouts").fetchone()[0]
+    cur.executemany(INSERT_WORKOUT_SQL, rows)
+    count = cur.rowcount
+    db.update_exercise_summary(cur, since_id)
+    return count
+
+
+def parse_workout(data):
+    """Zvaliduje jeden záznam tréninku.
+
+    Vrací (exercise, sets, reps, weight, note, date, client_key) a chybu. `date` (UTC)
+    a `client_key` jsou volitelné - posílá je offline klient, který série odesílá později.
+    Všechny chyby jsou trvalé (400) - stejný záznam nemá smysl posílat znovu.
+    """
+    if not isinstance(data, dict):
+        return None, "Neplatný záznam"
 
     exercise = data.get("exercise")
     sets = data.get("sets")
     reps = data.get("reps")
     weight = data.get("weight")
     note = data.get("note", "")
+    date = data.get("date")
+    client_key = data.get("client_key")
+
+    if not exercise:
+        return None, "Chybí název cviku"
+    if not isinstance(exercise, str) or len(exercise) > MAX_EXERCISE_LENGTH:
+        return None, "Neplatný název cviku"
+    if note is not None and (not isinstance(note, str) or len(note) > MAX_NOTE_LENGTH):
+        return None, "Neplatná poznámka"
 
     # Základní validace číselných polí
     try:
         sets = int(sets)
         reps = int(reps)
         weight = float(weight)
-    except (TypeError, ValueError):
-        return jsonify({"error": "Neplatné hodnoty pro sets/reps/weight"}), 400
+    except (TypeError, ValueError, OverflowError):
+        return None, "Neplatné hodnoty pro sets/reps/weight"
 
-    conn = get_db_connection()
-    cur = conn.cursor()
+    # Rozsahy: velká čísla by přetekla INTEGER v SQLite
+    if not 1 <= sets <= MAX_SETS:
+        return None, f"Počet sérií musí být 1-{MAX_SETS}"
+    if not 1 <= reps <= MAX_REPS:
+        return None, f"Počet opakování musí být 1-{MAX_REPS}"
+    if not math.isfinite(weight) or not 0 <= weight <= MAX_WEIGHT:
+        return None, f"Váha musí být 0-{MAX_WEIGHT:g} kg"
+
+    if client_key is not None and (not isinstance(client_key, str) or not 0 < len(client_key) <= 64):
+        return None, "Neplatný client_key"
+
+    if date is not None:
+        try:
+            parsed = datetime.datetime.fromisoformat(str(date))
+        except ValueError:
+            return None, "Neplatné datum"
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        # Stejný formát jako CURRENT_TIMESTAMP v SQLite
+        date = parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+    return (exercise, sets, reps, weight, note or "", date, client_key), None
+
+
+# 🏋️‍♂️ Přidání tréninku
+@app.route('/add_workout', methods=['POST'])
+@require_auth
+def add_workout():
+    data = request.get_json(silent=True)
+    user_id = g.user_id
+
+    row, error = parse_workout(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    # Zápis jde přes zapisovací frontu -> skupinový commit s ostatními requesty
+    count = writer.submit(lambda c: insert_workouts(c, [(user_id,) + row]))
+
+    # Opakované odeslání se stejným client_key je v pořádku (idempotence)
+    return jsonify({"message": "Trénink uložen", "duplicate": count == 0}), 201
+
+
+# 🏋️‍♂️ Hromadné přidání tréninků (celá session jedním requestem)
+@app.route('/add_workouts', methods=['POST'])
+@require_auth
+def add_workouts():
+    data = request.get_json(silent=True)
+    user_id = g.user_id
+
+    if not isinstance(data, dict):
+        return jsonify({"error": "Neplatná data"}), 400
+    items = data.get("workouts")
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Chybí seznam tréninků"}), 400
+    if len(items) > MAX_BATCH_WORKOUTS:
+        return jsonify({"error": f"Maximálně {MAX_BATCH_WORKOUTS} záznamů najednou"}), 400
+
+    # Validujeme vše předem -> buď se uloží celá dávka, nebo nic
+    rows = []
+    for index, item in enumerate(items):
+        row, error = parse_workout(item)
+        if error:
+            return jsonify({"error": error, "index": index}), 400
+        rows.append((user_id,) + row)
+
+    count = writer.submit(lambda c: insert_workouts(c, rows))
+
+    return jsonify({"message": "Tréninky uloženy", "count": count, "duplicates": len(rows) - count}), 201
+
+
+def workout_filters(user_id, args):
+    """Sestaví WHERE podmínku pro filtry historie (date_from, date_to, exercise)."""
+    where = "user_id = ?"
+    params = [user_id]
+    if args.get("exercise"):
+        where += " AND exercise = ?"
+        params.append(args["exercise"])
+    if args.get("date_from"):
+        where += " AND date >= ?"
+        params.append(args["date_from"])
+    if args.get("date_to"):
+        # date_to je včetně celého dne
+        where += " AND date < date(?, '+1 day')"
+        params.append(args["date_to"])
+    return where, params
+
+
+def history_version(user_id):
+    """Verze historie uživatele z průběžného souhrnu: (počet záznamů, datum posledního).
+
+    Tréninky se jen přidávají, takže každý nový záznam zvýší počet; souhrn má
+    jeden řádek na cvik, dotaz je tedy levný i při dlouhé historii.
+    """
+    cur = get_db().cursor()
     cur.execute(
-        "INSERT INTO workouts (user_id, exercise, sets, reps, weight, note) VALUES (?, ?, ?, ?, ?, ?)",
-        (user_id, exercise, sets, reps, weight, note)
+        "SELECT COALESCE(SUM(session_count), 0), MAX(last_date) FROM user_exercise_summary WHERE user_id=?",
+        (user_id,)
     )
-    conn.commit()
+    count, last_date = cur.fetchone()
     cur.close()
-    conn.close()
-
-    return jsonify({"message": "Trénink uložen"}), 201
+    return count, last_date
+
+
+WORKOUT_COLUMNS = ["id", "user_id", "exercise", "sets", "reps", "weight", "note", "date"]
+
+
+def conditional(view):
+    """ETag/Last-Modified pro čtecí endpointy; nezměněná data -> 304 bez dotazu do historie.
+
+    ETag zahrnuje i query string (filtry, kurzor stránky). Rozhoduje jen
+    If-None-Match: datum tréninku posílá klient (offline fronta), takže
+    Last-Modified je jen informativní a If-Modified-Since se neporovnává.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        count, last_date = history_version(g.user_id)
+        etag = f"{g.user_id}-{count}-{zlib.crc32(request.query_string):08x}"
+        if request.if_none_match.contains_weak(etag):
+            resp = Response(status=304)
+        else:
+            resp = app.make_response(view(*args, **kwargs))
+            if resp.status_code != 200:
+                return resp
+        resp.set_etag(etag, weak=True)
+        if last_date:
+            try:
+                resp.last_modified = datetime.datetime.strptime(last_date, "%Y-%m-%d %H:%M:%S").replace(
+                    tzinfo=datetime.timezone.utc)
+            except ValueError:
+                pass
+        # Klient smí odpověď uložit, ale před použitím ji musí ověřit
+        resp.headers["Cache-Control"] = "private, no-cache"
+        return resp
+    return wrapper
 
 
 # 📋 Získání tréninků uživatele
 @app.route('/get_workouts', methods=['GET'])
+@require_auth
+@conditional
 def get_workouts():
-    token = request.headers.get("Authorization")
-    if not token:
-        return jsonify({"error": "Token chybí"}), 401
+    user_id = g.user_id
+
+    fmt = request.args.get("format", "objects")
+    if fmt not in ("objects", "columns"):
+        return jsonify({"error": "Nepodporovaný formát (objects, columns)"}), 400
+
+    try:
+        limit = int(request.args.get("limit", WORKOUTS_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "Neplatný limit"}), 400
+    limit = max(1, min(limit, WORKOUTS_MAX_PAGE_SIZE))
+
+    where, params = workout_filters(user_id, request.args)
+
+    # Keyset stránkování: další stránka začíná za posledním (date, id) předchozí stránky
+    before_date = request.args.get("before_date")
+    before_id = request.args.get("before_id")
+    if before_date and before_id:
+        try:
+            params.append(before_date)
+            params.append(int(before_id))
+        except ValueError:
+            return jsonify({"error": "Neplatný kurzor"}), 400
+        where += " AND (date, id) < (?, ?)"
+    elif before_date:
+        where += " AND date < ?"
+        params.append(before_date)
+
+    conn = get_db()
+    cur = conn.cursor()
+    # O jeden řádek navíc -> víme, jestli existuje další stránka
+    cur.execute(
+        f"SELECT {', '.join(WORKOUT_COLUMNS)} FROM workouts"
+        f" WHERE {where} ORDER BY date DESC, id DESC LIMIT ?",
+        params + [limit + 1]
+    )
+    rows = cur.fetchall()
+    cur.close()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = {"before_date": rows[-1][7], "before_id": rows[-1][0]}
+
+    if fmt == "columns":
+        # Názvy sloupců jen jednou, řádky jako pole -> menší JSON a žádné dicty na řádek
+        return jsonify({"columns": WORKOUT_COLUMNS, "rows": [tuple(r) for r in rows], "next_cursor": next_cursor})
+    workouts = [dict(zip(WORKOUT_COLUMNS, r)) for r in rows]
+    return jsonify({"workouts": workouts, "next_cursor": next_cursor})
+
+
+# 🏆 Osobní rekordy (max. váha pro každý cvik)
+@app.route('/stats/personal_records', methods=['GET'])
+@require_auth
+@conditional
+def stats_personal_records():
+    user_id = g.user_id
+
+    conn = get_db()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT exercise, max_weight FROM user_exercise_summary WHERE user_id=? ORDER BY exercise",
+        (user_id,)
+    )
+    records = {r[0]: r[1] for r in cur.fetchall()}
+    cur.close()
+
+    return jsonify({"personal_records": records})
+
+
+# 📈 Progres pro každý cvik: první a poslední trénink, objem, PR (z průběžného souhrnu)
+PROGRESS_SQL = """
+SELECT exercise, first_date, first_weight, last_date, last_sets, last_reps, last_weight,
+       total_volume, max_weight, session_count
+FROM user_exercise_summary
+WHERE user_id = ?
+ORDER BY exercise
+"""
 
+
+@app.route('/stats/progress', methods=['GET'])
+@require_auth
+@conditional
+def stats_progress():
+    user_id = g.user_id
+
+    conn = get_db()
+    cur = conn.cursor()
+    # Souhrn i watermark čteme v jedné transakci (stejný snímek DB), jinak by
+    # klient přes /sync některý záznam započítal dvakrát nebo vůbec
+    cur.execute("BEGIN")
     try:
-        decoded = jwt.decode(token, app.config['SECRET_KEY'], algorithms=["HS256"])
-        user_id = decoded["user_id"]
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Neplatný token"}), 401
+        cur.execute(PROGRESS_SQL, (user_id,))
+        rows = cur.fetchall()
+        cur.execute("SELECT COALESCE(MAX(id), 0) FROM workouts WHERE user_id=?", (user_id,))
+        last_id = cur.fetchone()[0]
+    finally:
+        conn.commit()
+        cur.close()
+
+    progress = {
+        r[0]: {
+            "first_date": r[1],
+            "first_weight": r[2],
+            "latest": {
+                "date": r[3],
+                "sets": r[4],
+                "reps": r[5],
+                "weight": r[6],
+                "volume": r[4] * r[5] * r[6],
+            },
+            "total_volume": r[7],
+            "max_weight": r[8],
+            "entries": r[9],
+        }
+        for r in rows
+    }
 
-    conn = get_db_connection()
+    return jsonify({"progress": progress, "last_id": last_id})
+
+
+# 🔄 Delta sync: jen záznamy přidané po watermarku (id > since)
+@app.route('/sync', methods=['GET'])
+@require_auth
+def sync():
+    user_id = g.user_id
+
+    try:
+        since = int(request.args.get("since", 0))
+        limit = int(request.args.get("limit", WORKOUTS_MAX_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "Neplatný parametr since/limit"}), 400
+    limit = max(1, min(limit, WORKOUTS_MAX_PAGE_SIZE))
+
+    conn = get_db()
     cur = conn.cursor()
-    cur.execute("SELECT id, user_id, exercise, sets, reps, weight, note, date FROM workouts WHERE user_id=? ORDER BY date DESC", (user_id,))
+    cur.execute(
+        "SELECT id, exercise, sets, reps, weight, note, date FROM workouts"
+        " WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?",
+        (user_id, since, limit + 1)
+    )
     rows = cur.fetchall()
     cur.close()
-    conn.close()
 
-    # sqlite3.Row by šel převést na dict, ale používáme obyčejný cursor -> mapujeme ručně
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     workouts = [
-        {
-            "id": r[0],
-            "user_id": r[1],
-            "exercise": r[2],
-            "sets": r[3],
-            "reps": r[4],
-            "weight": r[5],
-            "note": r[6],
-            "date": r[7],
-        }
+        {"id": r[0], "exercise": r[1], "sets": r[2], "reps": r[3], "weight": r[4], "note": r[5], "date": r[6]}
         for r in rows
     ]
+    # Nový watermark = id posledního vráceného záznamu (bez změn zůstává since)
+    return jsonify({"workouts": workouts, "last_id": rows[-1][0] if rows else since, "has_more": has_more})
 
-    return jsonify({"workouts": workouts})
+
+EXPORT_COLUMNS = ["id", "exercise", "sets", "reps", "weight", "note", "date"]
+
+
+def _export_rows(where, params):
+    """Čte historii z kurzoru po dávkách; spojení drží jen po dobu streamu."""
+    conn = db.pool.acquire()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            f"SELECT {', '.join(EXPORT_COLUMNS)} FROM workouts WHERE {where} ORDER BY date, id",
+            params
+        )
+        while True:
+            rows = cur.fetchmany(EXPORT_CHUNK_SIZE)
+            if not rows:
+                break
+            yield rows
+        cur.close()
+    finally:
+        db.pool.release(conn)
+
+
+def _encode_ndjson(chunks):
+    for rows in chunks:
+        yield "".join(json.dumps(dict(zip(EXPORT_COLUMNS, r)), ensure_ascii=False) + "\n" for r in rows).encode("utf-8")
+
+
+def _encode_csv(chunks):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        # Prázdná historie -> aspoň hlavička
+        yield buf.getvalue().encode("utf-8")
+
+
+def _gzip_stream(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip hlavička
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# 📦 Export celé historie (stream NDJSON/CSV, volitelně gzip)
+@app.route('/export_workouts', methods=['GET'])
+@require_auth
+def export_workouts():
+    user_id = g.user_id
+
+    fmt = request.args.get("format", "ndjson")
+    if fmt == "ndjson":
+        encode, mimetype = _encode_ndjson, "application/x-ndjson"
+    elif fmt == "csv":
+        encode, mimetype = _encode_csv, "text/csv"
+    else:
+        return jsonify({"error": "Nepodporovaný formát (ndjson, csv)"}), 400
+
+    where, params = workout_filters(user_id, request.args)
+    body = encode(_export_rows(where, params))
+    headers = {"Content-Disposition": f"attachment; filename=workouts.{fmt}"}
+
+    # gzip na požádání (?gzip=1) nebo podle Accept-Encoding klienta
+    if request.args.get("gzip") == "1" or request.accept_encodings["gzip"]:
+        body = _gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+
+    return Response(body, mimetype=mimetype, headers=headers)
+
+
+@app.cli.command('rebuild-summary')
+def rebuild_summary_command():
+    """Přepočítá user_exercise_summary z historie (např. po ručním importu dat)."""
+    count = writer.submit(db.rebuild_exercise_summary)
+    print(f"Souhrn přepočítán ({count} řádků)")
 
 
 if __name__ == '__main__':
-    # Spuštění na portu 5001, aby nekolidoval s lokálním web serverem na 5000
-    app.run(debug=True, port=5001)
+    # Vývojový server; produkčně spouštějte backend/serve.py.
+    # Port 5001, aby nekolidoval s lokálním web serverem na 5000
+    app.run(debug=FLASK_DEBUG, port=SERVER_PORT)
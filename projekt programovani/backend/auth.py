@@ -0,0 +1,101 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+import jwt
+from flask import current_app, g, jsonify, request
+from config import TOKEN_CACHE_SIZE
+
+
+class TokenCache:
+    """LRU cache ověřených JWT.
+
+    Klíčem je SHA-256 tokenu (samotný token v paměti nedržíme), hodnotou
+    dekódované claims. Záznam platí jen do `exp` tokenu.
+    """
+
+    def __init__(self, maxsize=TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+
+    @staticmethod
+    def _key(token):
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def get(self, token):
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return claims
+
+    def put(self, token, claims):
+        if "exp" not in claims:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (claims["exp"], claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats["evicted"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        stats["maxsize"] = self.maxsize
+        return stats
+
+
+token_cache = TokenCache()
+
+
+def verify_token(token):
+    """Vrátí claims tokenu; plné ověření HMAC jen když token není v cache."""
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=["HS256"])
+        token_cache.put(token, claims)
+    return claims
+
+
+def require_auth(view):
+    """Ověří token z hlavičky Authorization (nebo pole "token" v JSON těle) a uloží g.user_id."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = request.headers.get("Authorization")
+        if not token and request.is_json:
+            body = request.get_json(silent=True)
+            token = body.get("token") if isinstance(body, dict) else None
+        if not token:
+            return jsonify({"error": "Token chybí"}), 401
+
+        try:
+            claims = verify_token(token)
+            g.user_id = claims["user_id"]
+        except jwt.ExpiredSignatureError:
+            return jsonify({"error": "Token vypršel"}), 401
+        except (jwt.InvalidTokenError, KeyError):
+            return jsonify({"error": "Neplatný token"}), 401
+
+        return view(*args, **kwargs)
+    return wrapper
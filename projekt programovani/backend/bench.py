@@ -0,0 +1,313 @@
+"""Benchmark a zátěžový test backendu.
+
+Vytvoří dočasnou databázi, naplní ji syntetickými uživateli a tréninky a
+pustí na vybrané endpointy N souběžných klientů (přes Flask test client nebo
+přes skutečný lokální HTTP server). Výsledek (p50/p99 latence, propustnost)
+vypíše jako JSON a volitelně porovná s uloženou baseline.
+
+Příklady:
+    python backend/bench.py --workouts 100000 --clients 8 --output bench.json
+    python backend/bench.py --mode server --baseline bench.json
+"""
+import argparse
+import datetime
+import http.client
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+SCENARIOS = ("register", "login", "add_workout", "get_workouts")
+EXERCISES = ["Bench press", "Dřepy", "Mrtvý tah", "Biceps curl", "Kliky", "Shyby", "Tlaky nad hlavu", "Přítahy"]
+BENCH_PASSWORD = "bench-heslo"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("client", "server"), default="client",
+                        help="client = Flask test client, server = lokální HTTP server (keep-alive)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="čárkou oddělené scénáře (%s)" % ", ".join(SCENARIOS))
+    parser.add_argument("--users", type=int, default=100, help="počet syntetických uživatelů")
+    parser.add_argument("--workouts", type=int, default=100000, help="celkový počet tréninků v DB (10^3 - 10^6)")
+    parser.add_argument("--clients", type=int, default=8, help="počet souběžných klientů")
+    parser.add_argument("--requests", type=int, default=200, help="počet požadavků na klienta a scénář")
+    parser.add_argument("--auth-requests", type=int, default=10,
+                        help="počet požadavků na klienta pro register/login (bcrypt je záměrně drahý)")
+    parser.add_argument("--bcrypt-rounds", type=int, default=None, help="přepíše BCRYPT_ROUNDS")
+    parser.add_argument("--seed", type=int, default=1, help="seed generátoru dat")
+    parser.add_argument("--output", help="soubor pro výsledky (JSON)")
+    parser.add_argument("--baseline", help="výsledky předchozího běhu pro porovnání")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="povolené zhoršení proti baseline (0.10 = 10 %%)")
+    return parser.parse_args(argv)
+
+
+def seed_database(path, users, workouts, password_hash, rng):
+    """Naplní DB přímo přes SQLite (rychlé hromadné vložení) a přepočítá souhrn."""
+    import db
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+        ((f"bench_user_{i}", password_hash) for i in range(users))
+    )
+    start = datetime.datetime(2020, 1, 1)
+    span = 5 * 365 * 24 * 3600
+
+    def rows():
+        for _ in range(workouts):
+            date = start + datetime.timedelta(seconds=rng.randrange(span))
+            yield (rng.randint(1, users), rng.choice(EXERCISES), rng.randint(1, 6), rng.randint(1, 15),
+                   float(rng.randint(5, 200)), "", date.strftime("%Y-%m-%d %H:%M:%S"))
+
+    conn.executemany(
+        "INSERT INTO workouts (user_id, exercise, sets, reps, weight, note, date) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        rows()
+    )
+    db.rebuild_exercise_summary(conn.cursor())
+    conn.execute("COMMIT")
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+class TestClientTransport:
+    """Požadavky přes Flask test client (bez sítě, měří jen aplikaci)."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None, headers=None):
+        resp = self.client.open(path, method=method, json=body, headers=headers or {})
+        return resp.status_code, resp.get_data()
+
+
+class HttpTransport:
+    """Požadavky přes skutečné HTTP spojení; jedno keep-alive spojení na klienta."""
+
+    def __init__(self, host, port):
+        self.conn = http.client.HTTPConnection(host, port, timeout=60)
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        try:
+            self.conn.request(method, path, body=payload, headers=headers)
+            resp = self.conn.getresponse()
+            return resp.status, resp.read()
+        except (http.client.HTTPException, OSError):
+            self.conn.close()  # další požadavek otevře nové spojení
+            raise
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def summarize(latencies, statuses, errors, elapsed):
+    ordered = sorted(latencies)
+    ms = lambda v: round(v * 1000, 3) if v is not None else None
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "p50_ms": ms(percentile(ordered, 0.50)),
+        "p90_ms": ms(percentile(ordered, 0.90)),
+        "p99_ms": ms(percentile(ordered, 0.99)),
+        "max_ms": ms(ordered[-1] if ordered else None),
+        "mean_ms": ms(sum(ordered) / len(ordered) if ordered else None),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def make_request(scenario, client_id, i, tokens, users, rng):
+    """Vrátí (method, path, body, headers) pro jeden požadavek scénáře."""
+    if scenario == "register":
+        return "POST", "/register", {"username": f"bench_new_{client_id}_{i}_{rng.random():.9f}",
+                                     "password": BENCH_PASSWORD}, None
+    if scenario == "login":
+        return "POST", "/login", {"username": f"bench_user_{rng.randrange(users)}",
+                                  "password": BENCH_PASSWORD}, None
+    token = tokens[client_id % len(tokens)]
+    if scenario == "add_workout":
+        return "POST", "/add_workout", {"exercise": rng.choice(EXERCISES), "sets": rng.randint(1, 6),
+                                        "reps": rng.randint(1, 15), "weight": float(rng.randint(5, 200))}, \
+            {"Authorization": token}
+    return "GET", "/get_workouts", None, {"Authorization": token}
+
+
+def run_scenario(scenario, transports, count, tokens, users, seed):
+    """Pustí `count` požadavků z každého klienta současně a změří latence."""
+    latencies = []
+    statuses = {}
+    errors = [0]
+    lock = threading.Lock()
+    barrier = threading.Barrier(len(transports) + 1)
+
+    def worker(client_id, transport):
+        rng = random.Random(f"{seed}-{scenario}-{client_id}")
+        local = []
+        local_statuses = {}
+        local_errors = 0
+        barrier.wait()
+        for i in range(count):
+            method, path, body, headers = make_request(scenario, client_id, i, tokens, users, rng)
+            started = time.perf_counter()
+            try:
+                status, _ = transport.request(method, path, body, headers)
+            except Exception:
+                local_errors += 1
+                continue
+            local.append(time.perf_counter() - started)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+            if status >= 400:
+                local_errors += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+            for status, n in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + n
+
+    threads = [threading.Thread(target=worker, args=(cid, t), daemon=True) for cid, t in enumerate(transports)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in threads:
+        t.join()
+    return summarize(latencies, statuses, errors[0], time.perf_counter() - started)
+
+
+def compare(results, baseline, threshold):
+    """Porovná p50/p99/propustnost s baseline; vrací (tabulka změn, seznam regresí)."""
+    changes = {}
+    regressions = []
+    for name, current in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        entry = {}
+        for metric, higher_is_worse in (("p50_ms", True), ("p99_ms", True), ("throughput_rps", False)):
+            old, new = base.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            entry[metric] = {"baseline": old, "current": new, "change": round(change, 4)}
+            worse = change > threshold if higher_is_worse else change < -threshold
+            if worse:
+                regressions.append(f"{name} {metric}: {old} -> {new} ({change:+.1%})")
+        changes[name] = entry
+    return changes, regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        sys.exit(f"Neznámé scénáře: {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix="fitness-bench-")
+    db_path = os.path.join(workdir, "fitness.db")
+    # Konfigurace se čte při importu -> proměnné prostředí nastavit před importem aplikace
+    os.environ["DATABASE_PATH"] = db_path
+    if args.bcrypt_rounds is not None:
+        os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    os.environ.setdefault("PASSWORD_QUEUE_LIMIT", str(max(16, args.clients * 2)))
+
+    import app as backend
+    import config
+    import db
+    from passwords import hasher
+
+    rng = random.Random(args.seed)
+    print(f"Plním {db_path}: {args.users} uživatelů, {args.workouts} tréninků...", file=sys.stderr)
+    seed_started = time.perf_counter()
+    seed_database(db_path, args.users, args.workouts, hasher.hash(BENCH_PASSWORD), rng)
+    seed_seconds = time.perf_counter() - seed_started
+
+    server = None
+    if args.mode == "server":
+        import logging
+        from werkzeug.serving import make_server
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)  # bez access logu každého požadavku
+        server = make_server("127.0.0.1", 0, backend.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        transports = [HttpTransport("127.0.0.1", server.server_port) for _ in range(args.clients)]
+    else:
+        transports = [TestClientTransport(backend.app) for _ in range(args.clients)]
+
+    # Každý klient pracuje s tokenem jednoho ze syntetických uživatelů
+    tokens = []
+    for cid in range(args.clients):
+        status, body = transports[cid].request("POST", "/login", {"username": f"bench_user_{cid % args.users}",
+                                                                  "password": BENCH_PASSWORD})
+        if status != 200:
+            sys.exit(f"Přihlášení syntetického uživatele selhalo: {status} {body[:200]!r}")
+        tokens.append(json.loads(body)["token"])
+
+    results = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "mode": args.mode,
+            "clients": args.clients,
+            "requests_per_client": args.requests,
+            "auth_requests_per_client": args.auth_requests,
+            "users": args.users,
+            "workouts": args.workouts,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "db_profile": config.DB_PROFILE,
+            "bcrypt_rounds": config.BCRYPT_ROUNDS,
+        },
+        "seed_seconds": round(seed_seconds, 2),
+        "scenarios": {},
+    }
+
+    for scenario in scenarios:
+        count = args.auth_requests if scenario in ("register", "login") else args.requests
+        print(f"Scénář {scenario}: {args.clients} klientů x {count} požadavků", file=sys.stderr)
+        results["scenarios"][scenario] = run_scenario(scenario, transports, count, tokens, args.users, args.seed)
+
+    if server is not None:
+        server.shutdown()
+    db.writer.stop()
+    db.pool.close_all()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        changes, regressions = compare(results, baseline, args.threshold)
+        results["baseline"] = {"file": args.baseline, "threshold": args.threshold,
+                               "changes": changes, "regressions": regressions}
+        if regressions:
+            print("Regrese proti baseline:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            exit_code = 1
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Komprese odpovědí podle Accept-Encoding klienta (brotli, pokud je nainstalované, jinak gzip).
+
+Komprimují se jen hotové (ne streamované) odpovědi 200 nad COMPRESS_MIN_SIZE
+bajtů; streamovaný export si gzip řeší sám a odpovědi s Content-Encoding se
+nechávají být.
+"""
+import gzip
+import threading
+
+from flask import request
+
+from config import BROTLI_QUALITY, COMPRESS_LEVEL, COMPRESS_MIN_SIZE
+
+try:
+    import brotli
+except ImportError:  # volitelná závislost
+    brotli = None
+
+COMPRESS_MIMETYPES = {"application/json", "application/x-ndjson", "text/csv", "text/plain", "text/html"}
+ENCODINGS = ["br", "gzip"] if brotli else ["gzip"]
+
+_stats = {"responses": 0, "bytes_in": 0, "bytes_out": 0}
+_lock = threading.Lock()
+
+
+def compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    # mtime=0 -> stejná data dají stejné bajty
+    return gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0)
+
+
+def init_app(app):
+    """Zaregistruje kompresi odpovědí (after_request)."""
+    if COMPRESS_MIN_SIZE <= 0:
+        return
+
+    @app.after_request
+    def _compress(response):
+        if response.mimetype not in COMPRESS_MIMETYPES:
+            return response
+        # Obsah závisí na Accept-Encoding i tehdy, když tahle odpověď zůstala nekomprimovaná
+        response.vary.add("Accept-Encoding")
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or "Content-Encoding" in response.headers or request.method == "HEAD"):
+            return response
+        encoding = request.accept_encodings.best_match(ENCODINGS)
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        body = compress(data, encoding)
+        if len(body) >= len(data):
+            return response
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+        with _lock:
+            _stats["responses"] += 1
+            _stats["bytes_in"] += len(data)
+            _stats["bytes_out"] += len(body)
+        return response
+
+
+def stats():
+    with _lock:
+        return dict(_stats)
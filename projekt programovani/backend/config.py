@@ -1,6 +1,97 @@
 import os
 
 # Základní konfigurace
-DATABASE_PATH = os.path.join(os.path.dirname(__file__), 'fitness.db')
+DATABASE_PATH = os.getenv('DATABASE_PATH', os.path.join(os.path.dirname(__file__), 'fitness.db'))
 SECRET_KEY = 'tajny_klic_pro_tokeny'
 CORS_ORIGINS = ['http://localhost:5000', 'http://127.0.0.1:5000']
+
+# Maximální počet nečinných SQLite spojení držených v poolu
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))
+
+# Profil SQLite: "performance" = WAL + synchronous=NORMAL (čtení neblokují zápisy),
+# "safe" = výchozí rollback journal + synchronous=FULL
+DB_PROFILE = os.getenv('DB_PROFILE', 'performance')
+DB_PROFILES = {
+    'performance': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,         # ms
+        'cache_size': -20000,         # záporné = KiB (~20 MB)
+        'mmap_size': 256 * 1024 * 1024,
+    },
+    'safe': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'busy_timeout': 5000,
+        'cache_size': -2000,
+        'mmap_size': 0,
+    },
+}
+DB_PRAGMAS = DB_PROFILES[DB_PROFILE]
+
+# Zapisovací fronta: kolik zápisů max. sloučit do jedné transakce
+# a jak dlouho (ms) čekat na další zápisy před commitem
+WRITE_BATCH_SIZE = int(os.getenv('WRITE_BATCH_SIZE', '200'))
+WRITE_BATCH_WAIT_MS = int(os.getenv('WRITE_BATCH_WAIT_MS', '0'))
+
+# Stránkování /get_workouts
+WORKOUTS_PAGE_SIZE = 100
+WORKOUTS_MAX_PAGE_SIZE = 500
+
+# Export historie: po kolika řádcích se čte z kurzoru a posílá klientovi
+EXPORT_CHUNK_SIZE = 500
+
+# Maximální počet záznamů v jednom požadavku /add_workouts
+MAX_BATCH_WORKOUTS = 500
+
+# Rozsahy hodnot jednoho záznamu tréninku (mimo rozsah -> 400, ne přetečení v SQLite)
+MAX_SETS = 1000
+MAX_REPS = 10000
+MAX_WEIGHT = 10000.0
+MAX_EXERCISE_LENGTH = 100
+MAX_NOTE_LENGTH = 1000
+
+# Počet ověřených JWT držených v paměti (hash tokenu -> claims)
+TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', '10000'))
+
+# Hesla: cena bcryptu (změna -> hash se přepočítá při dalším přihlášení),
+# počet vláken pro hashování, max. počet čekajících požadavků a časový limit (s)
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+PASSWORD_WORKERS = int(os.getenv('PASSWORD_WORKERS', str(min(4, os.cpu_count() or 1))))
+PASSWORD_QUEUE_LIMIT = int(os.getenv('PASSWORD_QUEUE_LIMIT', '16'))
+PASSWORD_TIMEOUT = float(os.getenv('PASSWORD_TIMEOUT', '10'))
+
+# Metriky (/metrics ve formátu Prometheus): měření requestů a SQL dotazů
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+# Hranice bucketů histogramů latence (s)
+METRICS_BUCKETS = tuple(float(b) for b in os.getenv(
+    'METRICS_BUCKETS', '0.001,0.0025,0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10').split(','))
+
+# Produkční server (serve.py): gunicorn na Linux/Mac, waitress na Windows
+SERVER_HOST = os.getenv('SERVER_HOST', '127.0.0.1')
+SERVER_PORT = int(os.getenv('SERVER_PORT', '5001'))
+# Počet procesů (jen gunicorn) a vláken v každém procesu
+SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', str(os.cpu_count() or 1)))
+SERVER_THREADS = int(os.getenv('SERVER_THREADS', '8'))
+# Jak dlouho (s) držet nečinné keep-alive spojení, délka fronty nepřijatých spojení
+SERVER_KEEPALIVE = int(os.getenv('SERVER_KEEPALIVE', '5'))
+SERVER_BACKLOG = int(os.getenv('SERVER_BACKLOG', '2048'))
+# Kolik sekund mají workery na dokončení rozpracovaných requestů při ukončení
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', '30'))
+# Vývojový server (python app.py): debugger a reloader jen na vyžádání
+FLASK_DEBUG = os.getenv('FLASK_DEBUG', '0') == '1'
+
+# JSON odpovědí: orjson (rychlejší, pokud je nainstalovaný) nebo stdlib
+JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'orjson')
+# Komprese odpovědí od této velikosti (B); 0 = vypnuto. Úroveň gzipu 1-9, kvalita brotli 0-11
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', '6'))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', '4'))
+
+# Logování: JSON řádky do rotovaného souboru (zapisuje je vlákno na pozadí)
+LOG_FILE = os.getenv('LOG_FILE', os.path.join(os.path.dirname(__file__), 'logs', 'backend.log'))
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+# Na konzoli jen varování a chyby (access log jde jen do souboru)
+LOG_CONSOLE_LEVEL = os.getenv('LOG_CONSOLE_LEVEL', 'WARNING').upper()
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
@@ -1,30 +1,383 @@
 import sqlite3
 import os
-from config import DATABASE_PATH
+import queue
+import threading
+import atexit
+import logging
+import time
+from flask import g
+import metrics
+from config import DATABASE_PATH, DB_POOL_SIZE, DB_PRAGMAS, WRITE_BATCH_SIZE, WRITE_BATCH_WAIT_MS
 
-def get_db_connection():
-    try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        conn.row_factory = sqlite3.Row
-        # Zapnout cizí klíče (pokud bychom je používali)
-        conn.execute('PRAGMA foreign_keys = ON;')
+log = logging.getLogger(__name__)
+
+
+def _open_connection(path, **kwargs):
+    # S metrikami vrací spojení, jehož kurzory měří čas dotazů a počet řádků
+    conn = sqlite3.connect(path, factory=metrics.connection_factory(), **kwargs)
+    conn.row_factory = sqlite3.Row
+    # Zapnout cizí klíče (pokud bychom je používali)
+    conn.execute('PRAGMA foreign_keys = ON;')
+    # Profil výkonu/trvanlivosti z config.py (WAL, synchronous, cache, mmap...)
+    for name, value in DB_PRAGMAS.items():
+        conn.execute(f'PRAGMA {name} = {value};')
+    return conn
+
+class ConnectionPool:
+    """Pool SQLite spojení sdílený vlákny Flask serveru.
+
+    Spojení se otevírá jen tehdy, když žádné volné není k dispozici,
+    PRAGMA se nastaví jednou při vytvoření a po requestu se spojení
+    vrací zpět do poolu místo zavření.
+    """
+
+    def __init__(self, path, max_idle=DB_POOL_SIZE):
+        self.path = path
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+        self._lock = threading.Lock()
+        self._stats = {"created": 0, "reused": 0, "closed": 0, "in_use": 0}
+
+    def _connect(self):
+        return _open_connection(self.path, check_same_thread=False)
+
+    def acquire(self):
+        try:
+            conn = self._idle.get_nowait()
+            reused = True
+        except queue.Empty:
+            conn = self._connect()
+            reused = False
+        with self._lock:
+            self._stats["reused" if reused else "created"] += 1
+            self._stats["in_use"] += 1
         return conn
-    except sqlite3.Error as err:
-        print(f"Chyba připojení k databázi: {err}")
-        raise
+
+    def release(self, conn):
+        # Nedokončenou transakci (např. po výjimce v handleru) zahodíme
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            self._stats["in_use"] -= 1
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+            with self._lock:
+                self._stats["closed"] += 1
+
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._stats["closed"] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["idle"] = self._idle.qsize()
+        stats["max_idle"] = self._idle.maxsize
+        return stats
+
+
+class _WriteJob:
+    __slots__ = ("func", "result", "error", "done")
+
+    def __init__(self, func):
+        self.func = func
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class WriteQueue:
+    """Jediný zapisovací thread se skupinovým commitem.
+
+    Requesty předávají funkce `func(cur)`, které se vykonají v jedné
+    transakci spolu s ostatními čekajícími zápisy. Každá funkce běží ve
+    vlastním SAVEPOINTu, takže chyba jednoho zápisu neshodí ostatní.
+    """
+
+    def __init__(self, path, batch_size=WRITE_BATCH_SIZE, max_wait_ms=WRITE_BATCH_WAIT_MS):
+        self.path = path
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {"batches": 0, "jobs": 0, "failed": 0, "max_batch": 0}
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, func, timeout=30):
+        """Zařadí zápis do fronty a počká na commit. Vrací výsledek `func`."""
+        job = _WriteJob(func)
+        self._ensure_started()
+        self._queue.put(job)
+        if not job.done.wait(timeout):
+            raise TimeoutError("Zápis do databáze nebyl dokončen včas")
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def stop(self):
+        with self._lock:
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    job = self._queue.get(timeout=remaining)
+                else:
+                    job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is _STOP:
+                # Dokončíme rozpracovanou dávku a skončíme
+                self._queue.put(_STOP)
+                break
+            batch.append(job)
+        return batch
+
+    def _run(self):
+        # isolation_level=None -> transakce řídíme sami (BEGIN/COMMIT)
+        conn = _open_connection(self.path, check_same_thread=False, isolation_level=None)
+        try:
+            while True:
+                job = self._queue.get()
+                if job is _STOP:
+                    break
+                self._commit_batch(conn, self._collect(job))
+        finally:
+            conn.close()
+
+    def _commit_batch(self, conn, batch):
+        cur = conn.cursor()
+        failed = 0
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            for job in batch:
+                cur.execute("SAVEPOINT job")
+                try:
+                    job.result = job.func(cur)
+                    cur.execute("RELEASE job")
+                except Exception as err:
+                    cur.execute("ROLLBACK TO job")
+                    cur.execute("RELEASE job")
+                    job.error = err
+                    failed += 1
+            cur.execute("COMMIT")
+        except sqlite3.Error as err:
+            log.exception("Chyba při zápisu dávky do databáze (%d úloh)", len(batch))
+            if conn.in_transaction:
+                conn.rollback()
+            for job in batch:
+                if job.error is None:
+                    job.result = None
+                    job.error = err
+                    failed += 1
+        finally:
+            cur.close()
+            with self._lock:
+                self._stats["batches"] += 1
+                self._stats["jobs"] += len(batch)
+                self._stats["failed"] += failed
+                self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+            for job in batch:
+                job.done.set()
+
+
+pool = ConnectionPool(DATABASE_PATH)
+writer = WriteQueue(DATABASE_PATH)
+# Při ukončení procesu dopíšeme frontu a zavřeme spojení
+atexit.register(pool.close_all)
+atexit.register(writer.stop)
+
+
+def get_db():
+    """Vrátí spojení z poolu navázané na aktuální app context."""
+    if 'db' not in g:
+        g.db = pool.acquire()
+    return g.db
+
+
+def close_db(exc=None):
+    conn = g.pop('db', None)
+    if conn is not None:
+        pool.release(conn)
+
+
+def init_app(app):
+    app.teardown_appcontext(close_db)
+
+
+def pool_stats():
+    return pool.stats()
+
+
+def writer_stats():
+    return writer.stats()
+
+
+# Souhrn user_exercise_summary: nové řádky workouts se započítají upsertem.
+# Pořadí zpracování nehraje roli - první/poslední záznam se určuje porovnáním (date, id).
+SUMMARY_UPSERT_SQL = """
+INSERT INTO user_exercise_summary (
+    user_id, exercise, max_weight, total_volume, session_count,
+    first_id, first_date, first_weight, last_id, last_date, last_weight, last_sets, last_reps
+)
+SELECT user_id, exercise, weight, sets * reps * weight, 1,
+       id, date, weight, id, date, weight, sets, reps
+FROM workouts
+WHERE id > ?
+ON CONFLICT (user_id, exercise) DO UPDATE SET
+    max_weight = MAX(max_weight, excluded.max_weight),
+    total_volume = total_volume + excluded.total_volume,
+    session_count = session_count + 1,
+    first_id = CASE WHEN (excluded.first_date, excluded.first_id) < (first_date, first_id) THEN excluded.first_id ELSE first_id END,
+    first_weight = CASE WHEN (excluded.first_date, excluded.first_id) < (first_date, first_id) THEN excluded.first_weight ELSE first_weight END,
+    first_date = CASE WHEN (excluded.first_date, excluded.first_id) < (first_date, first_id) THEN excluded.first_date ELSE first_date END,
+    last_id = CASE WHEN (excluded.last_date, excluded.last_id) > (last_date, last_id) THEN excluded.last_id ELSE last_id END,
+    last_weight = CASE WHEN (excluded.last_date, excluded.last_id) > (last_date, last_id) THEN excluded.last_weight ELSE last_weight END,
+    last_sets = CASE WHEN (excluded.last_date, excluded.last_id) > (last_date, last_id) THEN excluded.last_sets ELSE last_sets END,
+    last_reps = CASE WHEN (excluded.last_date, excluded.last_id) > (last_date, last_id) THEN excluded.last_reps ELSE last_reps END,
+    last_date = CASE WHEN (excluded.last_date, excluded.last_id) > (last_date, last_id) THEN excluded.last_date ELSE last_date END
+"""
+
+SUMMARY_REBUILD_SQL = """
+INSERT INTO user_exercise_summary (
+    user_id, exercise, max_weight, total_volume, session_count,
+    first_id, first_date, first_weight, last_id, last_date, last_weight, last_sets, last_reps
+)
+SELECT user_id, exercise, MAX(max_weight), MAX(total_volume), MAX(entries),
+       MAX(CASE WHEN rn_first = 1 THEN id END),
+       MAX(CASE WHEN rn_first = 1 THEN date END),
+       MAX(CASE WHEN rn_first = 1 THEN weight END),
+       MAX(CASE WHEN rn_last = 1 THEN id END),
+       MAX(CASE WHEN rn_last = 1 THEN date END),
+       MAX(CASE WHEN rn_last = 1 THEN weight END),
+       MAX(CASE WHEN rn_last = 1 THEN sets END),
+       MAX(CASE WHEN rn_last = 1 THEN reps END)
+FROM (
+    SELECT id, user_id, exercise, sets, reps, weight, date,
+           ROW_NUMBER() OVER (PARTITION BY user_id, exercise ORDER BY date, id) AS rn_first,
+           ROW_NUMBER() OVER (PARTITION BY user_id, exercise ORDER BY date DESC, id DESC) AS rn_last,
+           SUM(sets * reps * weight) OVER (PARTITION BY user_id, exercise) AS total_volume,
+           MAX(weight) OVER (PARTITION BY user_id, exercise) AS max_weight,
+           COUNT(*) OVER (PARTITION BY user_id, exercise) AS entries
+    FROM workouts
+    WHERE {where}
+)
+WHERE rn_first = 1 OR rn_last = 1
+GROUP BY user_id, exercise
+"""
+
+
+def update_exercise_summary(cur, since_id):
+    """Započítá do souhrnu všechny tréninky s id > since_id (volat ve stejné transakci jako INSERT)."""
+    cur.execute(SUMMARY_UPSERT_SQL, (since_id,))
+
+
+def rebuild_exercise_summary(cur, user_id=None):
+    """Přepočítá souhrn z celé historie (všech uživatelů nebo jednoho). Vrací počet řádků souhrnu."""
+    if user_id is None:
+        cur.execute("DELETE FROM user_exercise_summary")
+        cur.execute(SUMMARY_REBUILD_SQL.format(where="1"))
+    else:
+        cur.execute("DELETE FROM user_exercise_summary WHERE user_id = ?", (user_id,))
+        cur.execute(SUMMARY_REBUILD_SQL.format(where="user_id = ?"), (user_id,))
+    return cur.rowcount
+
+
+# Verze 1 je základní schema.sql, další migrace jsou v adresáři migrations/
+# ve tvaru NNN_popis.sql a aplikují se vzestupně podle čísla
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), 'schema.sql')
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+
+
+def _load_migrations():
+    migrations = [(1, 'schema', SCHEMA_PATH)]
+    for name in sorted(os.listdir(MIGRATIONS_DIR)):
+        prefix, _, rest = name.partition('_')
+        if name.endswith('.sql') and prefix.isdigit():
+            migrations.append((int(prefix), rest[:-4], os.path.join(MIGRATIONS_DIR, name)))
+    migrations.sort()
+    return migrations
+
+
+def _split_statements(script):
+    """Rozdělí SQL skript na jednotlivé příkazy (executescript by ukončil transakci)."""
+    statements, buf = [], ''
+    for line in script.splitlines(keepends=True):
+        buf += line
+        if sqlite3.complete_statement(buf):
+            statements.append(buf.strip())
+            buf = ''
+    if buf.strip():
+        statements.append(buf.strip())
+    return statements
+
+
+def _current_version(conn):
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
 
 def init_db():
-    """Inicializuje databázi podle schema.sql"""
+    """Aplikuje chybějící migrace schématu a vrátí aktuální verzi."""
+    conn = _open_connection(DATABASE_PATH, isolation_level=None)
     try:
-        schema_path = os.path.join(os.path.dirname(__file__), 'schema.sql')
-        with open(schema_path, 'r', encoding='utf-8') as f:
-            schema_sql = f.read()
-        with get_db_connection() as conn:
-            conn.executescript(schema_sql)
-        print("Databáze (SQLite) úspěšně inicializována")
-    except sqlite3.Error as err:
-        print(f"Chyba při inicializaci databáze: {err}")
-        raise
-    except Exception as e:
-        print(f"Neočekávaná chyba: {e}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS schema_version ("
+            " version INTEGER PRIMARY KEY,"
+            " name TEXT NOT NULL,"
+            " applied_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        )
+        migrations = _load_migrations()
+        if _current_version(conn) >= migrations[-1][0]:
+            return _current_version(conn)
+
+        # BEGIN IMMEDIATE: migruje vždy jen jeden proces, ostatní počkají a verzi znovu přečtou
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = _current_version(conn)
+            for version, name, path in migrations:
+                if version <= current:
+                    continue
+                with open(path, 'r', encoding='utf-8') as f:
+                    for statement in _split_statements(f.read()):
+                        conn.execute(statement)
+                conn.execute("INSERT INTO schema_version (version, name) VALUES (?, ?)", (version, name))
+                log.info("Migrace %03d_%s aplikována", version, name)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return _current_version(conn)
+    except sqlite3.Error:
+        log.exception("Chyba při inicializaci databáze")
         raise
+    finally:
+        conn.close()
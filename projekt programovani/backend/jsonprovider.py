@@ -0,0 +1,56 @@
+"""Rychlejší JSON pro Flask: orjson, pokud je nainstalovaný a JSON_PROVIDER není "stdlib", jinak standardní json."""
+from flask.json.provider import DefaultJSONProvider
+
+from config import JSON_PROVIDER
+
+try:
+    import orjson
+except ImportError:  # volitelná závislost
+    orjson = None
+
+
+class StdlibProvider(DefaultJSONProvider):
+    """Standardní json bez řazení klíčů a bez \\u escapování (kratší a rychlejší výstup)."""
+
+    sort_keys = False
+    ensure_ascii = False
+
+
+class OrjsonProvider(StdlibProvider):
+    """jsonify/request.get_json přes orjson; typy, které orjson nezná, řeší výchozí `default`."""
+
+    def _options(self):
+        options = orjson.OPT_NON_STR_KEYS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Volání s parametry stdlib (indent, separators ...) -> stdlib
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Bajty rovnou do odpovědi, bez převodu na str a zpětného kódování
+        body = orjson.dumps(obj, default=self.default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_app(app):
+    """Nastaví JSON provider aplikace podle JSON_PROVIDER."""
+    if orjson is not None and JSON_PROVIDER != "stdlib":
+        app.json = OrjsonProvider(app)
+    else:
+        app.json = StdlibProvider(app)
+    return app.json
+
+
+def provider_name(app):
+    return "orjson" if isinstance(app.json, OrjsonProvider) else "stdlib"
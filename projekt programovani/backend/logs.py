@@ -0,0 +1,139 @@
+"""Logování do JSON řádků přes frontu: volající vlákno jen vloží záznam do fronty,
+formátování a zápis do rotovaného souboru dělá vlákno QueueListeneru.
+
+Každý request dostane X-Request-ID (převezme se od klienta, nebo se vygeneruje);
+server ho vrací v odpovědi a přidává ke všem záznamům zalogovaným během requestu.
+"""
+import atexit
+import copy
+import datetime
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import time
+import uuid
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from flask import g, has_request_context, request
+
+from config import LOG_BACKUP_COUNT, LOG_CONSOLE_LEVEL, LOG_FILE, LOG_LEVEL, LOG_MAX_BYTES
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+# Atributy, které má každý LogRecord; ostatní (z extra=...) jdou do JSON jako pole
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Jeden záznam = jeden řádek JSON (čas, úroveň, logger, zpráva, request_id, extra pole)."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(
+                timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and value is not None:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RequestIdFilter(logging.Filter):
+    """Doplní request_id aktuálního requestu (běží ve vlákně, které loguje)."""
+
+    def filter(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = g.get("request_id") if has_request_context() else None
+        return True
+
+
+class FastQueueHandler(QueueHandler):
+    """QueueHandler, který v logujícím vlákně jen složí zprávu; JSON se formátuje až v listeneru."""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Traceback nejde přenést do jiného vlákna bez rizika, že se mezitím změní
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _log_path(per_process):
+    if not per_process:
+        return LOG_FILE
+    # Více procesů nesmí rotovat jeden soubor -> backend.<pid>.log
+    root, ext = os.path.splitext(LOG_FILE)
+    return f"{root}.{os.getpid()}{ext}"
+
+
+def setup_logging(per_process=False):
+    """Nastaví root logger: fronta -> (rotovaný JSON soubor, konzole). Volá se jednou za proces."""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    path = _log_path(per_process)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    file_handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                       encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter())
+
+    # Konzole na Windows bývá cp1252 -> znaky mimo kódování escapovat místo pádu
+    if hasattr(sys.stderr, "reconfigure"):
+        sys.stderr.reconfigure(errors="backslashreplace")
+    console_handler = logging.StreamHandler(sys.stderr)
+    console_handler.setLevel(LOG_CONSOLE_LEVEL)
+    console_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = FastQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    # Při ukončení dopsat frontu
+    atexit.register(_listener.stop)
+    return _listener
+
+
+def init_app(app):
+    """X-Request-ID pro každý request a access log (metoda, cesta, status, doba)."""
+    access_log = logging.getLogger("access")
+
+    @app.before_request
+    def _assign_request_id():
+        incoming = request.headers.get(REQUEST_ID_HEADER, "")
+        g.request_id = incoming if _REQUEST_ID_RE.match(incoming) else uuid.uuid4().hex
+        g.log_started = time.perf_counter()
+
+    @app.after_request
+    def _log_request(response):
+        request_id = g.get("request_id")
+        if request_id:
+            response.headers[REQUEST_ID_HEADER] = request_id
+        started = g.pop("log_started", None)
+        if started is not None and access_log.isEnabledFor(logging.INFO):
+            access_log.info("%s %s %s", request.method, request.path, response.status_code,
+                            extra={"status": response.status_code,
+                                   "duration_ms": round((time.perf_counter() - started) * 1000, 2)})
+        return response
@@ -0,0 +1,239 @@
+"""Metriky pro Prometheus: latence a počty requestů po routách a časy SQL dotazů.
+
+Vše se drží v paměti procesu; `/metrics` vrací textový formát Prometheus.
+"""
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, request
+
+from config import METRICS_BUCKETS, METRICS_ENABLED
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Histogram s pevnými hranicemi; jeden zámek pro všechny sady labelů."""
+
+    def __init__(self, name, help_text, label_names, buckets=METRICS_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                # [počty v bucketech..., +Inf, součet]
+                counts = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, list(counts)) for labels, counts in self._values.items()]
+        for labels, counts in sorted(items):
+            base = _labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f"{self.name}_bucket{{{base}{',' if base else ''}le=\"{le}\"}} {cumulative}")
+            lines.append(f"{self.name}_sum{_braces(base)} {counts[-1]}")
+            lines.append(f"{self.name}_count{_braces(base)} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_braces(_labels(self.label_names, labels))} {value}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def add(self, amount):
+        with self._lock:
+            self.value += amount
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge", f"{self.name} {self.value}"]
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _braces(labels):
+    return f"{{{labels}}}" if labels else ""
+
+
+http_requests = Counter("fitness_http_requests_total", "Počet HTTP requestů", ("route", "method", "status"))
+http_latency = Histogram("fitness_http_request_duration_seconds", "Doba zpracování requestu",
+                         ("route", "method"))
+http_in_flight = Gauge("fitness_http_requests_in_flight", "Právě zpracovávané requesty")
+db_latency = Histogram("fitness_db_query_duration_seconds", "Doba provedení SQL dotazu", ("query",))
+db_rows = Counter("fitness_db_rows_returned_total", "Počet řádků vrácených z SQL dotazů", ("query",))
+
+# Další zdroje metrik (pool, writer, cache ...): funkce vracející {název: hodnota}
+_collectors = []
+
+
+def register_stats(prefix, help_text, stats_func):
+    """Přidá číselné hodnoty ze stats() funkce jako gauge `<prefix>_<klíč>`."""
+    _collectors.append((prefix, help_text, stats_func))
+
+
+# ---- SQL ----
+
+_QUERY_RE = re.compile(r"^\s*(\w+)(?:.*?\b(?:FROM|INTO|UPDATE|TABLE|INDEX)\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?(\w+))?",
+                       re.IGNORECASE | re.DOTALL)
+_query_labels = {}
+
+
+def query_label(sql):
+    """Krátký label dotazu s omezenou kardinalitou, např. "SELECT workouts"."""
+    label = _query_labels.get(sql)
+    if label is None:
+        match = _QUERY_RE.match(sql)
+        if match:
+            label = match.group(1).upper() + (f" {match.group(2)}" if match.group(2) else "")
+        else:
+            label = "OTHER"
+        if len(_query_labels) < 1000:
+            _query_labels[sql] = label
+    return label
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Kurzor, který měří execute a počítá řádky vrácené fetch* metodami."""
+
+    _label = "OTHER"
+
+    def execute(self, sql, parameters=()):
+        self._label = query_label(sql)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            db_latency.observe((self._label,), time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._label = query_label(sql)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            db_latency.observe((self._label,), time.perf_counter() - started)
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            db_rows.inc((self._label,))
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        if rows:
+            db_rows.inc((self._label,), len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        if rows:
+            db_rows.inc((self._label,), len(rows))
+        return rows
+
+
+class TimedConnection(sqlite3.Connection):
+    """Spojení, jehož kurzory (i zkratky conn.execute) měří dotazy."""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def connection_factory():
+    """Třída spojení pro sqlite3.connect(factory=...); bez metrik obyčejné spojení."""
+    return TimedConnection if METRICS_ENABLED else sqlite3.Connection
+
+
+# ---- HTTP ----
+
+def init_app(app):
+    """Zaregistruje měření requestů (počty, latence, rozpracované requesty)."""
+    if not METRICS_ENABLED:
+        return
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+        http_in_flight.add(1)
+
+    @app.after_request
+    def _record(response):
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            # Route jako pravidlo (/get_workouts), ne konkrétní URL -> omezený počet labelů
+            route = request.url_rule.rule if request.url_rule else "<unmatched>"
+            http_latency.observe((route, request.method), time.perf_counter() - started)
+            http_requests.inc((route, request.method, str(response.status_code)))
+            http_in_flight.add(-1)
+        return response
+
+    @app.teardown_request
+    def _teardown(exc):
+        # Neošetřená výjimka -> after_request neproběhl
+        if g.pop("metrics_started", None) is not None:
+            route = request.url_rule.rule if request.url_rule else "<unmatched>"
+            http_requests.inc((route, request.method, "500"))
+            http_in_flight.add(-1)
+
+
+def render():
+    lines = []
+    for metric in (http_requests, http_latency, http_in_flight, db_latency, db_rows):
+        lines.extend(metric.render())
+    for prefix, help_text, stats_func in _collectors:
+        for key, value in sorted(stats_func().items()):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                name = f"{prefix}_{key}"
+                lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,7 @@
+-- Indexy pro historii uživatele (WHERE user_id=? ORDER BY date DESC, id DESC)
+-- id je v indexu kvůli stabilnímu pořadí záznamů se stejným datem
+
+CREATE INDEX IF NOT EXISTS idx_workouts_user_date ON workouts(user_id, date, id);
+
+-- user_stats je úzká tabulka -> index pokrývá i váhu a dotaz nemusí do tabulky
+CREATE INDEX IF NOT EXISTS idx_user_stats_user_date ON user_stats(user_id, date, weight);
@@ -0,0 +1,3 @@
+-- Filtr historie podle cviku (WHERE user_id=? AND exercise=? ORDER BY date DESC, id DESC)
+
+CREATE INDEX IF NOT EXISTS idx_workouts_user_exercise_date ON workouts(user_id, exercise, date, id);
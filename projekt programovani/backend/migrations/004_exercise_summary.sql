@@ -0,0 +1,46 @@
+-- Průběžně udržovaný souhrn pro každý cvik uživatele (PR, objem, první/poslední trénink).
+-- Aktualizuje se ve stejné transakci jako vložení tréninku, přepočet: flask rebuild-summary
+
+CREATE TABLE IF NOT EXISTS user_exercise_summary (
+    user_id INTEGER NOT NULL,
+    exercise TEXT NOT NULL,
+    max_weight REAL NOT NULL,
+    total_volume REAL NOT NULL,
+    session_count INTEGER NOT NULL,
+    first_id INTEGER NOT NULL,
+    first_date DATETIME,
+    first_weight REAL,
+    last_id INTEGER NOT NULL,
+    last_date DATETIME,
+    last_weight REAL,
+    last_sets INTEGER,
+    last_reps INTEGER,
+    PRIMARY KEY (user_id, exercise),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Naplnění z existující historie
+INSERT INTO user_exercise_summary (
+    user_id, exercise, max_weight, total_volume, session_count,
+    first_id, first_date, first_weight, last_id, last_date, last_weight, last_sets, last_reps
+)
+SELECT user_id, exercise, MAX(max_weight), MAX(total_volume), MAX(entries),
+       MAX(CASE WHEN rn_first = 1 THEN id END),
+       MAX(CASE WHEN rn_first = 1 THEN date END),
+       MAX(CASE WHEN rn_first = 1 THEN weight END),
+       MAX(CASE WHEN rn_last = 1 THEN id END),
+       MAX(CASE WHEN rn_last = 1 THEN date END),
+       MAX(CASE WHEN rn_last = 1 THEN weight END),
+       MAX(CASE WHEN rn_last = 1 THEN sets END),
+       MAX(CASE WHEN rn_last = 1 THEN reps END)
+FROM (
+    SELECT id, user_id, exercise, sets, reps, weight, date,
+           ROW_NUMBER() OVER (PARTITION BY user_id, exercise ORDER BY date, id) AS rn_first,
+           ROW_NUMBER() OVER (PARTITION BY user_id, exercise ORDER BY date DESC, id DESC) AS rn_last,
+           SUM(sets * reps * weight) OVER (PARTITION BY user_id, exercise) AS total_volume,
+           MAX(weight) OVER (PARTITION BY user_id, exercise) AS max_weight,
+           COUNT(*) OVER (PARTITION BY user_id, exercise) AS entries
+    FROM workouts
+)
+WHERE rn_first = 1 OR rn_last = 1
+GROUP BY user_id, exercise;
@@ -0,0 +1,6 @@
+-- Idempotentní zápisy: klient posílá ke každé sérii vlastní klíč,
+-- opakované odeslání stejného klíče se na serveru ignoruje
+
+ALTER TABLE workouts ADD COLUMN client_key TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_workouts_client_key ON workouts(user_id, client_key) WHERE client_key IS NOT NULL;
@@ -0,0 +1,3 @@
+-- Delta sync (WHERE user_id=? AND id > ? ORDER BY id) a watermark MAX(id) pro uživatele
+
+CREATE INDEX IF NOT EXISTS idx_workouts_user_id ON workouts(user_id, id);
@@ -0,0 +1,82 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import bcrypt
+from config import BCRYPT_ROUNDS, PASSWORD_WORKERS, PASSWORD_QUEUE_LIMIT, PASSWORD_TIMEOUT
+
+
+class PasswordPoolBusy(Exception):
+    """Fronta na hashování hesel je plná (nebo výpočet nestihl časový limit)."""
+
+
+class PasswordHasher:
+    """Hashování hesel bcryptem na vlastním omezeném poolu vláken.
+
+    bcrypt během výpočtu uvolňuje GIL, takže worker vlákna Flasku
+    zůstávají volná pro ostatní requesty. Pokud čeká víc než
+    `queue_limit` požadavků, další se hned odmítnou (PasswordPoolBusy -> 503).
+    """
+
+    def __init__(self, rounds=BCRYPT_ROUNDS, workers=PASSWORD_WORKERS,
+                 queue_limit=PASSWORD_QUEUE_LIMIT, timeout=PASSWORD_TIMEOUT):
+        self.rounds = rounds
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        # Sloty = běžící + čekající výpočty
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._lock = threading.Lock()
+        self._stats = {"hashed": 0, "checked": 0, "rehashed": 0, "rejected": 0, "in_flight": 0}
+        self.workers = workers
+        self.queue_limit = queue_limit
+
+    def _release(self, _future):
+        self._slots.release()
+        with self._lock:
+            self._stats["in_flight"] -= 1
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise PasswordPoolBusy()
+        with self._lock:
+            self._stats["in_flight"] += 1
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordPoolBusy()
+
+    def hash(self, password):
+        hashed = self._run(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(self.rounds))
+        with self._lock:
+            self._stats["hashed"] += 1
+        return hashed
+
+    def check(self, password, hashed):
+        ok = self._run(bcrypt.checkpw, password.encode('utf-8'), hashed)
+        with self._lock:
+            self._stats["checked"] += 1
+        return ok
+
+    def needs_rehash(self, hashed):
+        """True, pokud byl hash vytvořen s jinou cenou než je aktuální BCRYPT_ROUNDS."""
+        try:
+            # formát: $2b$12$<salt+hash>
+            return int(hashed.split(b'$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def count_rehash(self):
+        with self._lock:
+            self._stats["rehashed"] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update(rounds=self.rounds, workers=self.workers, queue_limit=self.queue_limit)
+        return stats
+
+
+hasher = PasswordHasher()
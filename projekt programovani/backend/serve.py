@@ -0,0 +1,73 @@
+"""Produkční spuštění backendu (bez debuggeru a reloaderu).
+
+Linux/Mac: gunicorn, SERVER_WORKERS procesů po SERVER_THREADS vláknech.
+Windows:   waitress, jeden proces se SERVER_THREADS vlákny (gunicorn na
+           Windows neběží).
+
+    python backend/serve.py
+"""
+import os
+
+from config import (SERVER_BACKLOG, SERVER_GRACEFUL_TIMEOUT, SERVER_HOST, SERVER_KEEPALIVE, SERVER_PORT,
+                    SERVER_THREADS, SERVER_WORKERS)
+
+
+def _worker_exit(server, worker):
+    # Dopsat frontu zápisů a zavřít spojení dřív, než proces skončí
+    import db
+    db.writer.stop()
+    db.pool.close_all()
+
+
+def run_gunicorn():
+    from gunicorn.app.base import BaseApplication
+
+    class FitnessApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{SERVER_HOST}:{SERVER_PORT}",
+                "workers": SERVER_WORKERS,
+                "threads": SERVER_THREADS,
+                "worker_class": "gthread",
+                "keepalive": SERVER_KEEPALIVE,
+                "backlog": SERVER_BACKLOG,
+                "graceful_timeout": SERVER_GRACEFUL_TIMEOUT,
+                # Aplikace se importuje až ve workeru (load() po forku) -> každý proces má
+                # vlastní DB pool, zapisovací vlákno a cache; vlákna rodiče by po forku neběžela
+                "preload_app": False,
+                "worker_exit": _worker_exit,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Každý worker vlastní soubor logů (backend.<pid>.log); rotace jednoho souboru
+            # z více procesů by se přetahovala
+            import logs
+            logs.setup_logging(per_process=True)
+            from app import app
+            return app
+
+    FitnessApplication().run()
+
+
+def run_waitress():
+    from waitress import serve
+    from app import app
+
+    # Waitress při Ctrl+C / ukončení služby dokončí rozpracované requesty;
+    # zápisy a spojení uklidí atexit handlery v db.py.
+    # channel_timeout zavírá jen nečinná spojení (bez rozpracovaného requestu)
+    serve(app, host=SERVER_HOST, port=SERVER_PORT, threads=SERVER_THREADS,
+          backlog=SERVER_BACKLOG, channel_timeout=SERVER_KEEPALIVE)
+
+
+def main():
+    if os.name == "nt":
+        run_waitress()
+    else:
+        run_gunicorn()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,13 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from typing import Optional, Dict, List
+import hashlib
+import logging
+import tempfile
+import time
+import uuid
+from typing import Optional, Dict, List, Iterator
 import os
 from dotenv import load_dotenv
 
@@ -10,42 +17,207 @@ load_dotenv()
 # Konfigurace API
 API_URL = os.getenv('API_URL', 'http://localhost:5001')
 
+# Časové limity (connect, read) v sekundách; login/registrace čekají na bcrypt
+DEFAULT_TIMEOUT = (3.05, 10)
+TIMEOUTS = {
+    "/login": (3.05, 15),
+    "/register": (3.05, 15),
+    "/add_workouts": (3.05, 20),
+    "/export_workouts": (3.05, 120),
+}
+
+# Opakování s exponenciálním backoffem (0.3 s, 0.6 s, 1.2 s ...).
+# Chyby spojení se opakují vždy (request neodešel), chyby čtení a 502/503/504
+# jen u idempotentních metod (GET).
+API_RETRIES = int(os.getenv('API_RETRIES', '3'))
+API_BACKOFF = float(os.getenv('API_BACKOFF', '0.3'))
+API_POOL_SIZE = int(os.getenv('API_POOL_SIZE', '4'))
+
+# Lokální cache GET odpovědí (revalidace přes ETag / If-None-Match)
+CACHE_DIR = os.getenv('API_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'http_cache'))
+CACHE_MAX_ENTRIES = int(os.getenv('API_CACHE_MAX_ENTRIES', '500'))
+
+# Každý request nese vlastní ID; server ho vrací a loguje -> dohledání v logu backendu
+REQUEST_ID_HEADER = "X-Request-ID"
+
+log = logging.getLogger("fitness.api")
+
+
+class ResponseCache:
+    """Odpovědi uložené na disku jako JSON {etag, body}, jeden soubor na URL a uživatele."""
+
+    def __init__(self, directory: str = CACHE_DIR, max_entries: int = CACHE_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, etag: str, body: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        # Zápis přes dočasný soubor + rename, ať po pádu nezůstane rozepsaný záznam
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"etag": etag, "body": body}, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        self._prune()
+
+    def _prune(self):
+        """Nejstarší záznamy (podle času zápisu) nad limit se smažou."""
+        try:
+            entries = [e for e in os.scandir(self.directory) if e.name.endswith(".json")]
+        except OSError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def decode_rows(data: Dict) -> List[Dict]:
+    """Převede sloupcovou odpověď ({"columns": [...], "rows": [[...]]}) na seznam dictů."""
+    if "columns" in data:
+        columns = data["columns"]
+        return [dict(zip(columns, row)) for row in data.get("rows", [])]
+    return data.get("workouts", [])
+
+
 class ApiClient:
-    def __init__(self):
+    def __init__(self, base_url: str = API_URL, cache: Optional[ResponseCache] = None):
         self.token = None
+        self.username = None
+        self.base_url = base_url
+        self.cache = cache if cache is not None else ResponseCache()
+        # Jedna session = keep-alive spojení znovu použitá mezi voláními
+        self.session = requests.Session()
+        retry = Retry(
+            total=API_RETRIES,
+            backoff_factor=API_BACKOFF,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=API_POOL_SIZE, max_retries=retry)
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+        self._calls = 0
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", TIMEOUTS.get(path, DEFAULT_TIMEOUT))
+        # Opakované pokusy (Retry) posílají stejné ID -> v logu serveru jde vidět, že jde o jeden požadavek
+        request_id = uuid.uuid4().hex
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), REQUEST_ID_HEADER: request_id}
+        self._calls += 1
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        except requests.RequestException as e:
+            log.warning("%s %s selhal: %s", method, path, e, extra={"request_id": request_id})
+            raise
+        if response.status_code >= 500:
+            log.warning("%s %s -> %s", method, path, response.status_code, extra={"request_id": request_id})
+        elif log.isEnabledFor(logging.DEBUG):
+            log.debug("%s %s -> %s", method, path, response.status_code,
+                      extra={"request_id": request_id,
+                             "duration_ms": round((time.perf_counter() - started) * 1000, 2)})
+        return response
+
+    def _cached_get(self, path: str, params: Optional[Dict] = None) -> requests.Response:
+        """GET s revalidací: pošle If-None-Match a na 304 vrátí tělo z lokální cache.
+
+        Vrácená odpověď má vždy status 200 a `.json()` s aktuálními daty, nebo
+        původní chybovou odpověď serveru.
+        """
+        query = "&".join(f"{k}={params[k]}" for k in sorted(params)) if params else ""
+        key = f"{self.username}|{self.base_url}{path}?{query}"
+        cached = self.cache.get(key)
+        headers = {"Authorization": self.token}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+
+        response = self._request("GET", path, headers=headers, params=params)
+        if response.status_code == 304 and cached:
+            self.cache.hits += 1
+            response.status_code = 200
+            response._content = json.dumps(cached["body"]).encode("utf-8")
+            return response
+        self.cache.misses += 1
+        etag = response.headers.get("ETag")
+        if response.status_code == 200 and etag:
+            self.cache.put(key, etag, response.json())
+        return response
+
+    def connection_stats(self) -> Dict:
+        """Kolik HTTP spojení se otevřelo vs. kolik requestů po nich prošlo."""
+        pools = self._adapter.poolmanager.pools
+        connections = requests_sent = 0
+        for key in pools.keys():
+            pool = pools[key]
+            connections += pool.num_connections
+            requests_sent += pool.num_requests
+        return {
+            "calls": self._calls,
+            "requests": requests_sent,
+            "connections": connections,
+            "reused": max(requests_sent - connections, 0),
+            "cache": self.cache.stats(),
+        }
+
+    def close(self):
+        self.session.close()
     
     def login(self, username: str, password: str) -> Optional[str]:
         """Přihlášení uživatele přes API"""
-        print(f"[API] Přihlášení uživatele: {username}")
-        print(f"[API] URL: {API_URL}/login")
         try:
-            response = requests.post(f"{API_URL}/login", json={
+            response = self._request("POST", "/login", json={
                 "username": username,
                 "password": password
-            }, timeout=5)
-            
-            print(f"[API] Status kód: {response.status_code}")
-            print(f"[API] Odpověď: {response.text}")
-            
+            })
+
             if response.status_code == 200:
                 data = response.json()
                 self.token = data.get('token')
-                print(f"[API] Token získán: {self.token[:20]}..." if self.token else "[API] Token nebyl vrácen!")
+                self.username = username
+                # Token ani tělo odpovědi se nelogují
+                log.info("Přihlášen uživatel %s", username)
                 return None  # úspěch
             else:
                 error_msg = response.json().get('error', 'Neznámá chyba při přihlášení')
-                print(f"[API] Chyba: {error_msg}")
+                log.info("Přihlášení %s selhalo: %s", username, error_msg,
+                         extra={"request_id": response.headers.get(REQUEST_ID_HEADER)})
                 return error_msg
-                
+
         except requests.RequestException as e:
-            error_msg = f"Chyba připojení k serveru: {str(e)}"
-            print(f"[API] Exception: {error_msg}")
-            return error_msg
+            return f"Chyba připojení k serveru: {str(e)}"
     
     def register(self, username: str, password: str, email: Optional[str] = None) -> Optional[str]:
         """Registrace nového uživatele"""
         try:
-            response = requests.post(f"{API_URL}/register", json={
+            response = self._request("POST", "/register", json={
                 "username": username,
                 "password": password,
                 "email": email
@@ -65,7 +237,7 @@ class ApiClient:
             return "Nejste přihlášeni"
             
         try:
-            response = requests.post(f"{API_URL}/add_workout", json={
+            response = self._request("POST", "/add_workout", json={
                 "token": self.token,
                 "exercise": exercise,
                 "sets": sets,
@@ -82,21 +254,160 @@ class ApiClient:
         except requests.RequestException as e:
             return f"Chyba připojení k serveru: {str(e)}"
     
-    def get_workouts(self) -> tuple[Optional[List[Dict]], Optional[str]]:
-        """Získání historie tréninků"""
+    def add_workouts(self, workouts: List[Dict], token: Optional[str] = None) -> tuple[Optional[str], Optional[int]]:
+        """Hromadné uložení tréninků jedním requestem (záznamy jako u add_workout).
+
+        `token` určuje účet, do kterého se záznamy uloží (outbox posílá token
+        uživatele, kterému série patří); bez něj se použije aktuální přihlášení.
+
+        Vrací (chyba, index). Index je vyplněný, jen když server odmítl konkrétní
+        záznam (4xx s polem `index`): opakované odeslání by skončilo stejně.
+        Ostatní chyby (výpadek, 5xx, vypršený token, 403/404/413 z proxy nebo
+        starého serveru) mají index None a zkusí se znovu později.
+        """
+        token = token or self.token
+        if not token:
+            return "Nejste přihlášeni", None
+
+        try:
+            response = self._request("POST", "/add_workouts", json={
+                "token": token,
+                "workouts": workouts
+            })
+
+            if response.status_code == 201:
+                return None, None  # úspěch
+            try:
+                data = response.json()
+            except ValueError:
+                data = {}
+            if not isinstance(data, dict):
+                data = {}
+            error = data.get('error', f'Neznámá chyba při ukládání tréninků ({response.status_code})')
+            index = data.get('index')
+            if 400 <= response.status_code < 500 and isinstance(index, int) and 0 <= index < len(workouts):
+                return error, index
+            return error, None
+
+        except requests.RequestException as e:
+            return f"Chyba připojení k serveru: {str(e)}", None
+
+    def get_personal_records(self) -> tuple[Optional[Dict], Optional[str]]:
+        """Osobní rekordy spočítané na serveru ({cvik: max. váha})"""
         if not self.token:
             return None, "Nejste přihlášeni"
-            
+
+        try:
+            response = self._cached_get("/stats/personal_records")
+
+            if response.status_code == 200:
+                return response.json().get('personal_records', {}), None
+            else:
+                return None, response.json().get('error', 'Neznámá chyba při načítání rekordů')
+
+        except requests.RequestException as e:
+            return None, f"Chyba připojení k serveru: {str(e)}"
+
+    def get_progress(self) -> tuple[Optional[Dict], Optional[str]]:
+        """Progres pro každý cvik spočítaný na serveru.
+
+        Vrací dict s klíči `progress` ({cvik: {first_date, first_weight,
+        latest: {date, sets, reps, weight, volume}, total_volume, max_weight,
+        entries}}) a `last_id` (watermark pro `sync`).
+        """
+        if not self.token:
+            return None, "Nejste přihlášeni"
+
         try:
-            response = requests.get(
-                f"{API_URL}/get_workouts",
-                headers={"Authorization": self.token}
+            response = self._cached_get("/stats/progress")
+
+            if response.status_code == 200:
+                data = response.json()
+                return {"progress": data.get('progress', {}), "last_id": data.get('last_id', 0)}, None
+            else:
+                return None, response.json().get('error', 'Neznámá chyba při načítání progresu')
+
+        except requests.RequestException as e:
+            return None, f"Chyba připojení k serveru: {str(e)}"
+
+    def sync(self, since: int, limit: Optional[int] = None) -> tuple[Optional[Dict], Optional[str]]:
+        """Záznamy přidané po watermarku (id > since), seřazené podle id.
+
+        Vrací dict s klíči `workouts`, `last_id` (nový watermark) a `has_more`.
+        """
+        if not self.token:
+            return None, "Nejste přihlášeni"
+
+        params = {"since": since}
+        if limit is not None:
+            params["limit"] = limit
+
+        try:
+            response = self._request(
+                "GET", "/sync",
+                headers={"Authorization": self.token},
+                params=params
             )
-            
+
+            if response.status_code == 200:
+                data = response.json()
+                return {"workouts": data.get('workouts', []), "last_id": data.get('last_id', since),
+                        "has_more": data.get('has_more', False)}, None
+            else:
+                return None, response.json().get('error', 'Neznámá chyba při synchronizaci')
+
+        except requests.RequestException as e:
+            return None, f"Chyba připojení k serveru: {str(e)}"
+
+    def get_workouts_page(self, limit: Optional[int] = None, cursor: Optional[Dict] = None,
+                          **filters) -> tuple[Optional[Dict], Optional[str]]:
+        """Získání jedné stránky historie tréninků (nejnovější první).
+
+        Vrací dict s klíči `workouts` a `next_cursor`; `next_cursor` se předává
+        do dalšího volání, None znamená poslední stránku. Filtry: date_from,
+        date_to, exercise.
+        """
+        if not self.token:
+            return None, "Nejste přihlášeni"
+
+        # Sloupcový formát: klíče se neopakují pro každý řádek
+        params = {k: v for k, v in filters.items() if v is not None}
+        params["format"] = "columns"
+        if limit is not None:
+            params["limit"] = limit
+        if cursor:
+            params.update(cursor)
+
+        try:
+            response = self._cached_get("/get_workouts", params)
+
             if response.status_code == 200:
-                return response.json().get('workouts', []), None
+                data = response.json()
+                return {"workouts": decode_rows(data), "next_cursor": data.get('next_cursor')}, None
             else:
                 return None, response.json().get('error', 'Neznámá chyba při načítání tréninků')
-                
+
         except requests.RequestException as e:
-            return None, f"Chyba připojení k serveru: {str(e)}"
\ No newline at end of file
+            return None, f"Chyba připojení k serveru: {str(e)}"
+
+    def iter_workout_pages(self, page_size: Optional[int] = None, **filters) -> Iterator[tuple[Optional[List[Dict]], Optional[str]]]:
+        """Líně prochází historii po stránkách; další stránka se stáhne až při dalším kroku."""
+        cursor = None
+        while True:
+            page, err = self.get_workouts_page(limit=page_size, cursor=cursor, **filters)
+            if err:
+                yield None, err
+                return
+            yield page["workouts"], None
+            cursor = page["next_cursor"]
+            if not cursor:
+                return
+
+    def get_workouts(self, **filters) -> tuple[Optional[List[Dict]], Optional[str]]:
+        """Získání celé historie tréninků (stáhne všechny stránky)"""
+        workouts = []
+        for page, err in self.iter_workout_pages(**filters):
+            if err:
+                return None, err
+            workouts.extend(page)
+        return workouts, None
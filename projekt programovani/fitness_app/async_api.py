@@ -0,0 +1,68 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from kivy.clock import Clock
+
+from api import ApiClient
+
+log = logging.getLogger("fitness.async_api")
+
+
+class AsyncApi:
+    """Spouští volání ApiClient na pozadí a výsledek doručí do hlavního vlákna Kivy.
+
+    UI vlákno tak nikdy nečeká na síť. Volání se stejným `tag` se navzájem
+    nahrazují: výsledek staršího požadavku se po doručení nového zahodí
+    (např. načtení statistik předchozího uživatele po odhlášení).
+    """
+
+    def __init__(self, api: ApiClient, workers: int = 4):
+        self.api = api
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+        self._lock = threading.Lock()
+        self._generations = {}
+
+    def call(self, method: str, *args, callback: Optional[Callable] = None,
+             on_error: Optional[Callable[[str], None]] = None, tag: Optional[str] = None, **kwargs):
+        """Zavolá `api.<method>(*args, **kwargs)` v poolu; `callback(result)` běží přes Clock.
+
+        Neočekávanou výjimku (ApiClient chyby jinak vrací jako hodnotu) dostane
+        `on_error(text)` - volající ví, jak z ní udělat svůj chybový stav.
+        """
+        generation = self._next_generation(tag) if tag else None
+        future = self._executor.submit(getattr(self.api, method), *args, **kwargs)
+
+        def done(fut):
+            try:
+                result = fut.result()
+            except Exception as e:
+                log.exception("Neočekávaná chyba při volání %s", method)
+                message = f"Neočekávaná chyba: {e}"
+                Clock.schedule_once(lambda _dt: self._deliver(tag, generation, on_error, message))
+                return
+            Clock.schedule_once(lambda _dt: self._deliver(tag, generation, callback, result))
+
+        future.add_done_callback(done)
+        return future
+
+    def cancel(self, tag: str):
+        """Zneplatní rozběhnuté požadavky s daným tagem (jejich výsledek se nedoručí)."""
+        self._next_generation(tag)
+
+    def _next_generation(self, tag):
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            return self._generations[tag]
+
+    def _deliver(self, tag, generation, callback, result):
+        if tag is not None:
+            with self._lock:
+                if self._generations.get(tag) != generation:
+                    return  # mezitím přišel novější požadavek / zrušeno
+        if callback is not None:
+            callback(result)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
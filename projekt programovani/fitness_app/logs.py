@@ -0,0 +1,70 @@
+"""Logování desktop aplikace do data/logs/app.log (JSON řádky).
+
+Loggery aplikace jsou pod "fitness" (fitness.api, fitness.main ...), aby se
+nemíchaly s handlery, které Kivy přidává na root logger. Soubor zapisuje
+vlákno QueueListeneru, UI vlákno na disk nečeká.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FILE = os.getenv('LOG_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'logs', 'app.log'))
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(2 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '3'))
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Řádek JSON; `request_id` (z ApiClient) odpovídá záznamu v logu backendu.
+
+    QueueHandler skládá zprávu už při vložení do fronty, traceback je proto součástí `msg`.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key in ("request_id", "duration_ms"):
+            if getattr(record, key, None) is not None:
+                entry[key] = getattr(record, key)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def setup_logging():
+    """Připojí logger "fitness" přes frontu k rotovanému souboru. Volá se jednou při startu."""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                       encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger("fitness")
+    logger.setLevel(LOG_LEVEL)
+    logger.addHandler(QueueHandler(log_queue))
+    # Na root loggeru jsou handlery Kivy; ty by dostaly i INFO záznamy
+    logger.propagate = False
+
+    # Varování a chyby i do konzole, odkud se aplikace spouští (cp1252 -> escapovat, nepadat)
+    if hasattr(sys.stderr, "reconfigure"):
+        sys.stderr.reconfigure(errors="backslashreplace")
+    console_handler = logging.StreamHandler(sys.stderr)
+    console_handler.setLevel(logging.WARNING)
+
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
@@ -4,26 +4,72 @@ from kivy.properties import StringProperty, DictProperty, ListProperty, NumericP
 from kivy.uix.popup import Popup
 from kivy.uix.label import Label
 from kivy.core.window import Window
+from kivy.clock import Clock
 from kivy.uix.widget import Widget
 from kivy.graphics.texture import Texture
 from kivy.uix.button import Button
-from kivy.uix.modalview import ModalView
+from bisect import bisect_left
+from collections import OrderedDict
+import logging
+
+import logs
+from api import ApiClient
+from async_api import AsyncApi
+from outbox import Outbox, OutboxSync
+
+log = logging.getLogger("fitness.main")
+
+# Barevné zastávky gradientu: (pozice 0..1, (r, g, b, a))
+GRADIENT_STOPS = ((0.0, (10, 60, 30, 255)), (1.0, (41, 186, 93, 255)))
+GRADIENT_CACHE_SIZE = 16
+_gradient_cache = OrderedDict()
+
+# Rozsahy hodnot série (stejné jako na serveru, jinak by série skončila odmítnutá)
+MAX_SETS = 1000
+MAX_REPS = 10000
+MAX_WEIGHT = 10000.0
+
+
+def gradient_buffer(height, stops):
+    """RGBA buffer 1 x height s lineární interpolací mezi zastávkami, jeden souvislý bytearray."""
+    positions = [p for p, _ in stops]
+    buf = bytearray(height * 4)
+    for y in range(height):
+        # Úsek gradientu a poměr v něm stačí spočítat jednou na řádek
+        t = y / (height - 1) if height > 1 else 0.0
+        i = min(max(bisect_left(positions, t), 1), len(stops) - 1)
+        (p0, c0), (p1, c1) = stops[i - 1], stops[i]
+        k = (t - p0) / (p1 - p0) if p1 > p0 else 0.0
+        k = min(max(k, 0.0), 1.0)
+        buf[y * 4:y * 4 + 4] = bytes(int(a + (b - a) * k + 0.5) for a, b in zip(c0, c1))
+    return bytes(buf)
+
+
+def gradient_texture(height=64, stops=GRADIENT_STOPS):
+    """Sdílená textura gradientu; stejná velikost a zastávky = stejná textura na GPU."""
+    key = (height, tuple((p, tuple(c)) for p, c in stops))
+    texture = _gradient_cache.get(key)
+    if texture is not None:
+        _gradient_cache.move_to_end(key)
+        return texture
+    texture = Texture.create(size=(1, height), colorfmt='rgba')
+    texture.blit_buffer(gradient_buffer(height, key[1]), colorfmt='rgba', bufferfmt='ubyte')
+    texture.wrap = 'repeat'
+    texture.uvsize = (1, -1)
+    _gradient_cache[key] = texture
+    if len(_gradient_cache) > GRADIENT_CACHE_SIZE:
+        _gradient_cache.popitem(last=False)
+    return texture
+
 
 class GradientBackground(Widget):
     gradient_texture = ObjectProperty(None)
-    
+    gradient_height = NumericProperty(64)
+    gradient_stops = ObjectProperty(GRADIENT_STOPS)
+
     def create_gradient_texture(self):
-        texture = Texture.create(size=(1, 64), colorfmt='rgba')
-        buf = bytes()
-        for i in range(64):
-            r = int(10 + i * 0.5)
-            g = int(60 + i * 2)
-            b = int(30 + i * 1)
-            buf += bytes([r, g, b, 255])
-        texture.blit_buffer(buf, colorfmt='rgba', bufferfmt='ubyte')
-        texture.wrap = 'repeat'
-        texture.uvsize = (1, -1)
-        return texture
+        # Textura se táhne přes celou plochu, změna velikosti widgetu ji nemění
+        return gradient_texture(int(self.gradient_height), self.gradient_stops)
 
 # Nastavení velikosti a základní barvy okna
 Window.size = (1200, 700)
@@ -32,6 +78,18 @@ Window.minimum_width = 800
 Window.minimum_height = 600
 
 
+def sync_rows(rv, texts):
+    """Srovná data RecycleView se seznamem textů; přepíše jen řádky, které se liší."""
+    data = rv.data
+    for i, text in enumerate(texts):
+        if i >= len(data):
+            data.append({"text": text})
+        elif data[i]["text"] != text:
+            data[i] = {"text": text}
+    if len(data) > len(texts):
+        del data[len(texts):]
+
+
 # ======== OBRAZOVKY ========
 
 class MainScreen(Screen):
@@ -57,30 +115,53 @@ class MainScreen(Screen):
     
     def logout(self):
         if self.workouts_screen:
+            # Rozběhnuté načítání už nepatří přihlášenému uživateli
+            self.workouts_screen.async_api.cancel("progress")
+            self.workouts_screen.async_api.cancel("sync")
+            self.workouts_screen.last_seen_id = 0
+            # Rozpracované série pustíme k odeslání, ať se při odhlášení neztratí
+            self.workouts_screen.commit_session()
+            # Fronta odhlášeného uživatele čeká na jeho další přihlášení; token se zahodí,
+            # aby se s ním nic dalšího neodeslalo
+            if self.workouts_screen.sync:
+                self.workouts_screen.sync.pause()
+            self.workouts_screen.api.token = None
+            self.workouts_screen.api.username = None
             # Reset workout data (už neukládáme do users.json)
             self.workouts_screen.workout_data = []
-            self.workouts_screen.ids.workout_list.text = ""
+            self.workouts_screen.session_keys = []
+            self.workouts_screen.ids.workout_list.data = []
             self.workouts_screen.ids.note.text = ""
             
         self.manager.current = "login"
 
-from api import ApiClient
 
 class LoginScreen(Screen):
+    loading = BooleanProperty(False)
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.api = ApiClient()
+        self.async_api = AsyncApi(self.api)
 
     def login(self):
+        if self.loading:
+            return
         username = self.ids.username.text
         password = self.ids.password.text
 
-        print(f"[DEBUG] Pokus o přihlášení: {username}")
-        error = self.api.login(username, password)
-        print(f"[DEBUG] Výsledek login: error={error}, token={self.api.token}")
-        
+        log.debug("Pokus o přihlášení: %s", username)
+        # Přihlášení běží na pozadí, UI mezitím ukazuje stav načítání
+        self.loading = True
+        self.async_api.call("login", username, password, tag="login",
+                            callback=lambda error: self.on_login_result(username, error),
+                            on_error=lambda error: self.on_login_result(username, error))
+
+    def on_login_result(self, username, error):
+        self.loading = False
+
         if error is None:  # přihlášení úspěšné
-            print(f"[DEBUG] Přihlášení úspěšné, přepínám na main screen")
+            log.debug("Přihlášení úspěšné, přepínám na main screen")
             self.manager.current = "main"
             main_screen = self.manager.get_screen("main")
             main_screen.username = username
@@ -94,21 +175,53 @@ class LoginScreen(Screen):
             
             if workouts_screen:
                 workouts_screen.api = self.api  # Sdílej token
+                workouts_screen.async_api = self.async_api
+                workouts_screen.start_sync(username)
                 workouts_screen.load_user_data(username)
-                # Načtení dat z API
-                workouts, api_error = self.api.get_workouts()
-                if workouts and not api_error:
-                    # TODO: Implementovat zobrazení workoutů z API
-                    pass
         else:
-            print(f"[DEBUG] Přihlášení selhalo: {error}")
+            log.debug("Přihlášení selhalo: %s", error)
             popup = Popup(title="Chyba",
                           content=Label(text=str(error)),
                           size_hint=(0.5, 0.3))
             popup.open()
 
 
-
+def merge_workout(progress, w):
+    """Započítá jeden nový záznam do progresu cviku (stejná pravidla jako souhrn na serveru).
+
+    Nové záznamy mají vždy vyšší id, takže při shodném datu vyhrává u
+    posledního tréninku nový záznam a u prvního původní.
+    """
+    volume = w["sets"] * w["reps"] * w["weight"]
+    latest = {"date": w["date"], "sets": w["sets"], "reps": w["reps"], "weight": w["weight"], "volume": volume}
+    p = progress.get(w["exercise"])
+    if p is None:
+        progress[w["exercise"]] = {
+            "first_date": w["date"],
+            "first_weight": w["weight"],
+            "latest": latest,
+            "total_volume": volume,
+            "max_weight": w["weight"],
+            "entries": 1,
+        }
+        return
+    p["total_volume"] += volume
+    p["entries"] += 1
+    p["max_weight"] = max(p["max_weight"], w["weight"])
+    if w["date"] < p["first_date"]:
+        p["first_date"] = w["date"]
+        p["first_weight"] = w["weight"]
+    if w["date"] >= p["latest"]["date"]:
+        p["latest"] = latest
+
+
+class ExerciseRow(Button):
+    """Řádek výběru cviku; RecycleView ho znovu používá pro různé cviky."""
+    screen = ObjectProperty(None, allownone=True)
+
+    def on_release(self):
+        if self.screen:
+            self.screen.select_exercise(self.text)
 
 
 class WorkoutsScreen(Screen):
@@ -118,14 +231,65 @@ class WorkoutsScreen(Screen):
     progress_data = DictProperty()  # New: Track progress over time
     selected_exercise = StringProperty("")
     show_exercises = BooleanProperty(False)
+    loading = BooleanProperty(False)
+    pending_sync = NumericProperty(0)  # série čekající na odeslání na server
+    rejected_sync = NumericProperty(0)  # série, které server odmítl (zůstávají odložené v outboxu)
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.api = ApiClient()
+        self.async_api = AsyncApi(self.api)
+        self.outbox = Outbox()
+        self.sync = None
+        self.username = ""
+        self.session_keys = []  # client_key sérií rozpracovaného tréninku
+        self.last_seen_id = 0  # watermark: id posledního záznamu započítaného v progress_data
+        self._resync = False
+        # Seřazený index (casefold, název) pro hledání podle prefixu
+        self._exercise_keys = []
+        self._exercise_names = []
+        # Víc změn seznamu během jednoho snímku -> jedna aktualizace
+        self._exercise_trigger = Clock.create_trigger(lambda _dt: self.update_exercise_list())
+        self._exercise_trigger()
+
+    def start_sync(self, username):
+        """Spustí odesílání lokální fronty sérií pro přihlášeného uživatele."""
+        self.username = username
+        if self.sync is None:
+            self.sync = OutboxSync(self.outbox, self.api,
+                                   on_synced=lambda n: Clock.schedule_once(lambda _dt: self.on_synced(n)),
+                                   on_rejected=lambda items: Clock.schedule_once(lambda _dt: self.on_rejected(items)))
+        self.sync.api = self.api
+        self.sync.start(username, self.api.token)
+        self.pending_sync = self.outbox.count(username)
+        self.rejected_sync = len(self.outbox.rejected(username))
+
+    def on_rejected(self, items):
+        self.pending_sync = self.outbox.count(self.username)
+        self.rejected_sync = len(self.outbox.rejected(self.username))
+        lines = [f"{w['exercise']} {w['sets']}x{w['reps']}, {w['weight']}kg: {error}" for w, error in items[:5]]
+        if len(items) > 5:
+            lines.append(f"... a dalších {len(items) - 5}")
+        popup = Popup(title="Server odmítl série",
+                      content=Label(text="\n".join(lines), halign="center"),
+                      size_hint=(0.7, 0.4))
+        popup.open()
+
+    def on_synced(self, count):
+        self.pending_sync = self.outbox.count(self.username)
+        # Na serveru přibyla data -> dotáhnout jen nové záznamy
+        self.sync_changes()
 
     def load_user_data(self, username):
-        """Načte data uživatele z API a spočítá PR a progres."""
-        workouts, err = self.api.get_workouts()
+        """Načte z API osobní rekordy a progres (agregace počítá server)."""
+        # Nový požadavek s tagem "progress" zahodí výsledek případného staršího
+        self.loading = True
+        self.async_api.call("get_progress", tag="progress", callback=self.on_progress_loaded,
+                            on_error=lambda error: self.on_progress_loaded((None, error)))
+
+    def on_progress_loaded(self, result):
+        self.loading = False
+        data, err = result
         if err:
             popup = Popup(title="Chyba",
                           content=Label(text=f"Nepodařilo se načíst tréninky: {err}"),
@@ -133,64 +297,84 @@ class WorkoutsScreen(Screen):
             popup.open()
             return
 
-        # Reset lokálních agregací
-        self.personal_records = {}
-        self.progress_data = {}
+        # /stats/progress obsahuje i max. váhu -> PR nepotřebují další request
+        self.last_seen_id = data["last_id"]
+        self.apply_progress(data["progress"])
+
+        # Během načítání mohla přibýt data -> dorovnat přes delta sync
+        if self._resync:
+            self._resync = False
+            self.sync_changes()
+
+    def apply_progress(self, progress):
+        self.progress_data = progress
+        self.personal_records = {ex: p['max_weight'] for ex, p in progress.items()}
 
         # Doplnit seznam cviků dle historie
-        seen_exercises = set(self.exercises)
-
-        # Pro každý workout spočítat PR a progres
-        for w in workouts:
-            ex = w.get('exercise')
-            sets = int(w.get('sets', 0) or 0)
-            reps = int(w.get('reps', 0) or 0)
-            weight = float(w.get('weight', 0) or 0)
-            date = w.get('date')
-
-            if ex not in seen_exercises:
-                self.exercises.append(ex)
-                seen_exercises.add(ex)
-
-            # PR: maximální váha pro daný cvik
-            if ex not in self.personal_records or weight > float(self.personal_records.get(ex, 0)):
-                self.personal_records[ex] = weight
-
-            # Progres: uložení historie
-            if ex not in self.progress_data:
-                self.progress_data[ex] = []
-            self.progress_data[ex].append({
-                'date': date,
-                'sets': sets,
-                'reps': reps,
-                'weight': weight,
-                'volume': sets * reps * weight
-            })
+        new_exercises = [ex for ex in progress if ex not in self.exercises]
+        if new_exercises:
+            self.exercises.extend(new_exercises)
+
+    def sync_changes(self):
+        """Dotáhne jen záznamy s id > last_seen_id a přičte je k progresu (O(nové záznamy))."""
+        if self.loading:
+            # Plné načtení ještě běží a watermark zatím nemáme
+            self._resync = True
+            return
+        since = self.last_seen_id
+        self.async_api.call("sync", since, tag="sync",
+                            callback=lambda result: self.on_changes(since, result),
+                            on_error=lambda error: self.on_changes(since, (None, error)))
+
+    def on_changes(self, since, result):
+        data, err = result
+        if err:
+            # Nevadí: při další synchronizaci se zkusí znovu od stejného watermarku
+            log.warning("Delta sync selhal: %s", err)
+            return
+        if since != self.last_seen_id:
+            # Mezitím proběhlo plné načtení -> tato data už jsou započítaná
+            return
+
+        if data["workouts"]:
+            progress = dict(self.progress_data)
+            for w in data["workouts"]:
+                merge_workout(progress, w)
+            self.apply_progress(progress)
+        self.last_seen_id = data["last_id"]
+
+        if data["has_more"]:
+            self.sync_changes()
 
     def on_exercises(self, instance, value):
-        self.update_exercise_list()
+        self._exercise_trigger()
 
     def update_exercise_list(self):
+        """Přestaví index cviků a zobrazí seznam podle aktuálního hledání."""
+        index = sorted((exercise.casefold(), exercise) for exercise in self.exercises)
+        self._exercise_keys = [key for key, _ in index]
+        self._exercise_names = [name for _, name in index]
+        search = self.ids.get('exercise_search', None)
+        self.filter_exercises(search.text if search else "")
+
+    def filter_exercises(self, query):
         exercise_list = self.ids.get('exercise_list', None)
-        if exercise_list:
-            exercise_list.clear_widgets()
-            for exercise in self.exercises:
-                btn = Button(
-                    text=exercise,
-                    size_hint_y=None,
-                    height=48,
-                    background_color=(0.2, 0.2, 0.2, 1)
-                )
-                btn.bind(on_release=lambda b: self.select_exercise(b.text))
-                exercise_list.add_widget(btn)
+        if not exercise_list:
+            return
+        query = query.strip().casefold()
+        if query:
+            # Binární hledání v seřazeném indexu: O(log n + počet shod)
+            lo = bisect_left(self._exercise_keys, query)
+            hi = bisect_left(self._exercise_keys, query + "\U0010ffff")
+            names = self._exercise_names[lo:hi]
+        else:
+            names = self.exercises
+        exercise_list.data = [{"text": name, "screen": self} for name in names]
 
     def toggle_exercise_list(self):
         """Show or hide the right-side exercise panel."""
         # Toggle flag; kv bindings handle visibility/disabled state
         self.show_exercises = not self.show_exercises
-        if self.show_exercises:
-            # populate list when opening
-            self.update_exercise_list()
 
     def select_exercise(self, exercise_name):
         self.selected_exercise = exercise_name
@@ -219,26 +403,25 @@ class WorkoutsScreen(Screen):
             popup.open()
             return
 
-        # Okamžité uložení do DB přes API (včetně aktuální poznámky)
-        note = self.ids.note.text
-        error = self.api.add_workout(
-            exercise=self.selected_exercise,
-            sets=int(sets),
-            reps=int(reps),
-            weight=float(weight),
-            note=note or ""
-        )
-        if error:
+        try:
+            valid = (1 <= int(sets) <= MAX_SETS and 1 <= int(reps) <= MAX_REPS
+                     and 0 <= float(weight) <= MAX_WEIGHT)
+        except ValueError:
+            valid = False
+        if not valid:
             popup = Popup(title="Chyba",
-                          content=Label(text=f"Chyba při ukládání: {error}"),
-                          size_hint=(0.6, 0.35))
+                          content=Label(text=f"Série 1-{MAX_SETS}, opakování 1-{MAX_REPS}, váha 0-{MAX_WEIGHT:g} kg"),
+                          size_hint=(0.6, 0.3))
             popup.open()
             return
 
-        # Přidáme do lokálního zobrazení pro přehled
+        # Série se hned uloží do lokální fronty (přežije i výpadek serveru);
+        # na server odejde na pozadí po uložení tréninku
         entry = f"{self.selected_exercise} - {sets}x{reps}, {weight}kg"
+        key = self.outbox.add(self.username, self.selected_exercise, int(sets), int(reps), float(weight))
+        self.session_keys.append(key)
         self.workout_data.append((self.selected_exercise, int(sets), int(reps), float(weight)))
-        self.ids.workout_list.text += f"{entry}\n"
+        self.ids.workout_list.data.append({"text": entry})
 
         # aktualizace osobních rekordů
         if self.selected_exercise not in self.personal_records or float(weight) > self.personal_records[self.selected_exercise]:
@@ -249,13 +432,11 @@ class WorkoutsScreen(Screen):
         self.ids.reps.text = ""
         self.ids.weight.text = ""
 
-
-
     def remove_last(self):
         if self.workout_data:
             self.workout_data.pop()
-            lines = self.ids.workout_list.text.strip().split("\n")
-            self.ids.workout_list.text = "\n".join(lines[:-1])
+            self.outbox.discard(self.session_keys.pop())
+            self.ids.workout_list.data.pop()
         else:
             popup = Popup(title="Chyba",
                           content=Label(text="Žádné cviky k odstranění."),
@@ -272,12 +453,13 @@ class WorkoutsScreen(Screen):
 
         note = self.ids.note.text
         summary = "\n".join([f"{ex} - {s}x{r}, {w}kg" for ex, s, r, w in self.workout_data])
-        # Data se ukládají průběžně při přidání cviku; jen přenačteme data z API a přepočítáme PR/progres
-        self.load_user_data(App.get_running_app().root.get_screen("main").username)
+
+        # Série jsou už v lokální frontě, tady je jen pustíme k odeslání
+        self.commit_session()
 
         popup = Popup(
             title="Uloženo",
-            content=Label(text=f"Trénink průběžně ukládán do DB.\n\n{summary}\n\nPoznámka uložena u záznamů:\n{note if note else '(žádná)'}"),
+            content=Label(text=f"Trénink uložen, na server se odešle na pozadí.\n\n{summary}\n\nPoznámka uložena u záznamů:\n{note if note else '(žádná)'}"),
             size_hint=(0.7, 0.7),
         )
         popup.bind(on_dismiss=self.back_to_dashboard)
@@ -285,9 +467,19 @@ class WorkoutsScreen(Screen):
 
         # reset polí
         self.workout_data = []
-        self.ids.workout_list.text = ""
+        self.session_keys = []
+        self.ids.workout_list.data = []
         self.ids.note.text = ""
 
+    def commit_session(self):
+        """Označí série rozpracovaného tréninku k odeslání (s aktuální poznámkou) a probudí sync."""
+        if not self.session_keys:
+            return
+        self.outbox.commit_session(self.session_keys, self.ids.note.text or "")
+        self.pending_sync = self.outbox.count(self.username)
+        if self.sync:
+            self.sync.wake()
+
     def back_to_dashboard(self, *_):
         """Vrátí uživatele zpět na hlavní obrazovku."""
         # Find the MainScreen instance and switch to workouts view
@@ -295,7 +487,6 @@ class WorkoutsScreen(Screen):
         main_screen.switch_view('workouts')
 
 
-
 class StatsScreen(Screen):
     user_weight = NumericProperty(0)
     personal_records = DictProperty()
@@ -311,38 +502,53 @@ class StatsScreen(Screen):
             popup = Popup(title="Chyba", content=Label(text="Zadej číslo!"), size_hint=(0.5, 0.3))
             popup.open()
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._source = None
+        # Víc změn za jeden snímek (např. načtení progresu) -> jedno překreslení
+        self._refresh_trigger = Clock.create_trigger(lambda _dt: self.refresh())
+
     def on_enter(self):
         # Find the WorkoutsScreen instance inside the MainScreen
-        main_screen = App.get_running_app().root.get_screen('main')
-        for widget in main_screen.walk():
-            if isinstance(widget, WorkoutsScreen):
-                self.personal_records = widget.personal_records
-                self.progress_data = widget.progress_data
-                break
-        
-        # Update PR display
-        self.ids.pr_label.text = ""
+        if self._source is None:
+            main_screen = App.get_running_app().root.get_screen('main')
+            for widget in main_screen.walk():
+                if isinstance(widget, WorkoutsScreen):
+                    self._source = widget
+                    # Statistiky sledují data průběžně, ne jen při přepnutí obrazovky
+                    widget.bind(personal_records=lambda *_: self._refresh_trigger(),
+                                progress_data=lambda *_: self._refresh_trigger())
+                    break
+        self.refresh()
+
+    def refresh(self):
+        """Přepočítá řádky PR a progresu; překreslí se jen ty, které se změnily."""
+        if self._source is None:
+            return
+        self.personal_records = self._source.personal_records
+        self.progress_data = self._source.progress_data
+
         if self.personal_records:
-            for ex, w in self.personal_records.items():
-                self.ids.pr_label.text += f"{ex}: {w} kg\n"
+            records = [f"{ex}: {w} kg" for ex, w in self.personal_records.items()]
         else:
-            self.ids.pr_label.text = "(zatím žádné PR)"
+            records = ["(zatím žádné PR)"]
+        sync_rows(self.ids.pr_list, records)
 
-        # Update progress display
-        self.ids.progress_label.text = ""
+        rows = []
         if self.progress_data:
             for exercise, data in self.progress_data.items():
-                latest = data[-1]
-                first = data[0]
-                progress = latest['weight'] - first['weight']
+                latest = data['latest']
+                progress = latest['weight'] - data['first_weight']
                 progress_text = "🔺" if progress > 0 else "🔻" if progress < 0 else "="
-                
-                self.ids.progress_label.text += f"\n{exercise}:\n"
-                self.ids.progress_label.text += f"  Poslední trénink: {latest['sets']}x{latest['reps']} @ {latest['weight']}kg\n"
-                self.ids.progress_label.text += f"  Progress: {abs(progress)}kg {progress_text}\n"
-                self.ids.progress_label.text += f"  Celkový objem: {latest['volume']}kg\n"
+                rows.append(
+                    f"{exercise}:\n"
+                    f"  Poslední trénink: {latest['sets']}x{latest['reps']} @ {latest['weight']}kg\n"
+                    f"  Progress: {abs(progress)}kg {progress_text}\n"
+                    f"  Celkový objem: {data['total_volume']}kg"
+                )
         else:
-            self.ids.progress_label.text = "(zatím žádný progress)"
+            rows.append("(zatím žádný progress)")
+        sync_rows(self.ids.progress_list, rows)
 
 
 # ======== APLIKACE ========
@@ -354,6 +560,14 @@ class FitnessApp(App):
         sm.add_widget(MainScreen(name="main"))
         return sm
 
+    def on_stop(self):
+        # Neodeslané série zůstávají v outbox.db a odešlou se po dalším přihlášení
+        workouts_screen = self.root.get_screen("main").workouts_screen
+        if workouts_screen and workouts_screen.sync:
+            workouts_screen.sync.stop()
+
 
 if __name__ == "__main__":
+    # Logy do data/logs/app.log (JSON řádky), zapisuje je vlákno na pozadí
+    logs.setup_logging()
     FitnessApp().run()
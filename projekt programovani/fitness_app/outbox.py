@@ -0,0 +1,207 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from api import ApiClient
+
+OUTBOX_PATH = os.path.join(os.path.dirname(__file__), 'data', 'outbox.db')
+
+
+class Outbox:
+    """Lokální SQLite fronta sérií, které ještě nejsou na serveru.
+
+    Série se zapíše hned při přidání jako rozpracovaná (ready=0). Uložením
+    tréninku se označí k odeslání (ready=1) a OutboxSync je pak po dávkách
+    pošle na server. Každá série má vlastní client_key, takže opakované
+    odeslání po výpadku spojení nevytvoří na serveru duplicitu. Sérii, kterou
+    server trvale odmítne (4xx), odloží (ready=2) i s chybou, aby neblokovala
+    ostatní.
+    """
+
+    def __init__(self, path: str = OUTBOX_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode = WAL;')
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " client_key TEXT UNIQUE NOT NULL,"
+            " username TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " note TEXT NOT NULL DEFAULT '',"
+            " ready INTEGER NOT NULL DEFAULT 0,"
+            " error TEXT)"
+        )
+        # Starší outbox.db bez sloupce error
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(outbox)")}
+        if "error" not in columns:
+            self._conn.execute("ALTER TABLE outbox ADD COLUMN error TEXT")
+
+    def add(self, username: str, exercise: str, sets: int, reps: int, weight: float) -> str:
+        """Uloží rozpracovanou sérii a vrátí její client_key."""
+        client_key = uuid.uuid4().hex
+        payload = {
+            "exercise": exercise,
+            "sets": sets,
+            "reps": reps,
+            "weight": weight,
+            # Čas provedení série, ne čas odeslání (UTC jako na serveru)
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "client_key": client_key,
+        }
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO outbox (client_key, username, payload) VALUES (?, ?, ?)",
+                (client_key, username, json.dumps(payload))
+            )
+        return client_key
+
+    def discard(self, client_key: str) -> bool:
+        """Smaže ještě neodeslanou sérii. False = už je na serveru."""
+        with self._lock:
+            return self._conn.execute("DELETE FROM outbox WHERE client_key = ?", (client_key,)).rowcount > 0
+
+    def commit_session(self, client_keys: List[str], note: str = ""):
+        """Označí série tréninku k odeslání a doplní k nim poznámku."""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE outbox SET ready = 1, note = ? WHERE client_key = ?",
+                [(note, key) for key in client_keys]
+            )
+
+    def release_drafts(self, username: str):
+        """Rozpracované série z minula (pád aplikace) pustí k odeslání."""
+        with self._lock:
+            self._conn.execute("UPDATE outbox SET ready = 1 WHERE username = ? AND ready = 0", (username,))
+
+    def pending(self, username: str, limit: int) -> List[tuple]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, payload, note FROM outbox WHERE username = ? AND ready = 1 ORDER BY id LIMIT ?",
+                (username, limit)
+            ).fetchall()
+        return [(row_id, dict(json.loads(payload), note=note)) for row_id, payload, note in rows]
+
+    def park(self, row_id: int, error: str):
+        """Odloží sérii odmítnutou serverem; dál se neodesílá, zůstává pro kontrolu."""
+        with self._lock:
+            self._conn.execute("UPDATE outbox SET ready = 2, error = ? WHERE id = ?", (error, row_id))
+
+    def rejected(self, username: str) -> List[tuple]:
+        """Odložené série uživatele jako (payload, chyba)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload, note, error FROM outbox WHERE username = ? AND ready = 2 ORDER BY id",
+                (username,)
+            ).fetchall()
+        return [(dict(json.loads(payload), note=note), error) for payload, note, error in rows]
+
+    def remove(self, ids: List[int]):
+        with self._lock:
+            self._conn.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+
+    def count(self, username: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE username = ? AND ready = 1", (username,)
+            ).fetchone()[0]
+
+
+class OutboxSync:
+    """Vlákno, které na pozadí vyprazdňuje Outbox na server přes /add_workouts.
+
+    Při chybě (server nedostupný) opakuje s exponenciálně rostoucí pauzou.
+    Záznam, který server odmítne (4xx), se odloží a zbytek fronty se odesílá dál.
+    `on_synced(počet)` a `on_rejected([(payload, chyba)])` se volají z vlákna
+    synchronizace - UI si je musí přeplánovat do hlavního vlákna.
+
+    Uživatel a jeho token se drží jako jedna dvojice: série se vždy odesílají
+    s tokenem uživatele, kterému patří, i když se mezitím přihlásí někdo jiný.
+    """
+
+    def __init__(self, outbox: Outbox, api: ApiClient, on_synced: Optional[Callable[[int], None]] = None,
+                 on_rejected: Optional[Callable[[List[tuple]], None]] = None,
+                 batch_size: int = 100, interval: float = 5.0, max_backoff: float = 60.0):
+        self.outbox = outbox
+        self.api = api
+        self.on_synced = on_synced
+        self.on_rejected = on_rejected
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self._account = (None, None)  # (username, token) - mění se jedním přiřazením
+        self.last_error = None
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def username(self) -> Optional[str]:
+        return self._account[0]
+
+    def start(self, username: str, token: str):
+        self._account = (username, token)
+        self.outbox.release_drafts(username)
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="outbox-sync", daemon=True)
+            self._thread.start()
+        self.wake()
+
+    def wake(self):
+        """Odeslat hned, bez čekání na další interval."""
+        self._wake.set()
+
+    def pause(self):
+        """Odhlášení: další dávky se neodesílají, dokud start() nenastaví nového uživatele.
+
+        Právě odesílaná dávka doběhne s tokenem svého uživatele.
+        """
+        self._account = (None, None)
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def _run(self):
+        delay = self.interval
+        while not self._stopped.is_set():
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            self.last_error = self._drain()
+            delay = self.interval if self.last_error is None else min(delay * 2, self.max_backoff)
+
+    def _drain(self) -> Optional[str]:
+        username, token = self._account
+        if not username or not token:
+            return None
+        sent = 0
+        rejected = []
+        try:
+            while True:
+                batch = self.outbox.pending(username, self.batch_size)
+                if not batch:
+                    return None
+                error, index = self.api.add_workouts([payload for _, payload in batch], token=token)
+                if error and index is not None:
+                    # Trvalá chyba záznamu: odložit ho a zbytek dávky poslat znovu hned
+                    row_id, payload = batch[index]
+                    self.outbox.park(row_id, error)
+                    rejected.append((payload, error))
+                    continue
+                if error:
+                    return error
+                self.outbox.remove([row_id for row_id, _ in batch])
+                sent += len(batch)
+        finally:
+            if sent and self.on_synced:
+                self.on_synced(sent)
+            if rejected and self.on_rejected:
+                self.on_rejected(rejected)
@@ -1,2 +1,3 @@
 # Spustí backend přímo přes Python z virtuálního prostředí (bez nutnosti aktivace)
-& ".\.venv\Scripts\python.exe" "backend\app.py"
+# serve.py = produkční server (waitress, více vláken, bez debuggeru); vývojový server: backend\app.py
+& ".\.venv\Scripts\python.exe" "backend\serve.py"
@@ -1,7 +1,7 @@
 # Aktivace společného virtuálního prostředí a spuštění procesů
 
 # Spuštění backendu s root .venv
-Start-Process powershell -ArgumentList "-NoExit -Command `". .\\.venv\\Scripts\\Activate.ps1; python backend\\app.py`""
+Start-Process powershell -ArgumentList "-NoExit -Command `". .\\.venv\\Scripts\\Activate.ps1; python backend\\serve.py`""
 
 # Spuštění desktop aplikace s root .venv
 Start-Process powershell -ArgumentList "-NoExit -Command `". .\\.venv\\Scripts\\Activate.ps1; python fitness_app\\main.py`""
@@ -20,6 +20,20 @@ document.addEventListener('DOMContentLoaded', () => {
   const dashboard = id('dashboard');
   const workoutsList = id('workouts-list');
   const workoutsEmpty = id('workouts-empty');
+  const workoutsMore = id('workouts-more');
+  const statsList = id('stats-list');
+
+  // Historie se načítá po stránkách; nextCursor ukazuje na další stránku (null = konec)
+  const WORKOUTS_PAGE_SIZE = 5;
+  let nextCursor = null;
+
+  // Statistiky se načtou jednou, pak se dotahují jen nové záznamy (id > lastSeenId)
+  const SYNC_INTERVAL_MS = 30000;
+  let progress = {};
+  let lastSeenId = 0;
+  // Historie načtená (i prázdná, pak lastSeenId = 0); generace ruší rozběhnutý sync po odhlášení/novém načtení
+  let historyLoaded = false;
+  let statsGeneration = 0;
 
   // Wire UI actions
   [btnGet, heroGet, purchaseStart].forEach(b => b && b.addEventListener('click', openRegister));
@@ -27,6 +41,7 @@ document.addEventListener('DOMContentLoaded', () => {
   id('reg-cancel').addEventListener('click', closeModals);
   id('login-cancel').addEventListener('click', closeModals);
   btnLogout && btnLogout.addEventListener('click', logout);
+  workoutsMore && workoutsMore.addEventListener('click', () => fetchAndRenderWorkouts(nextCursor));
 
   // Register submit
   regForm.addEventListener('submit', async (e) => {
@@ -93,10 +108,19 @@ document.addEventListener('DOMContentLoaded', () => {
     setLoggedInUI(savedUser);
     downloadArea.classList.remove('hidden');
     fetchAndRenderWorkouts();
+    fetchAndRenderStats();
   } else {
     setLoggedOutUI();
   }
 
+  // Při návratu na stránku a pravidelně dotáhnout změny (např. z desktop aplikace)
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'visible') syncStats();
+  });
+  setInterval(() => {
+    if (document.visibilityState === 'visible') syncStats();
+  }, SYNC_INTERVAL_MS);
+
   // Helpers
   function id(name){ return document.getElementById(name); }
   function showMsg(elId, text){ const el = id(elId); if (el) el.innerText = text || ''; }
@@ -138,6 +162,13 @@ document.addEventListener('DOMContentLoaded', () => {
     downloadArea.classList.add('hidden');
     if (dashboard) dashboard.classList.add('hidden');
     if (workoutsList) workoutsList.innerHTML = '';
+    if (workoutsMore) workoutsMore.classList.add('hidden');
+    if (statsList) statsList.innerHTML = '';
+    nextCursor = null;
+    progress = {};
+    lastSeenId = 0;
+    historyLoaded = false;
+    statsGeneration++;
   }
 
   async function loginInternal(username, password){
@@ -176,13 +207,14 @@ document.addEventListener('DOMContentLoaded', () => {
     if (h3) h3.innerText = `Děkujeme, ${username} — přístup aktivní`;
   }
 
-  async function fetchAndRenderWorkouts(){
+  async function fetchAndRenderWorkouts(cursor){
     const token = localStorage.getItem('amp_token');
     if (!token) return;
     try {
       // rychlý ping (volitelně)
       // await fetch(`${API_URL}/ping`);
-      const res = await fetch(`${API_URL}/get_workouts`, {
+      const params = new URLSearchParams({ limit: WORKOUTS_PAGE_SIZE, format: 'columns', ...(cursor || {}) });
+      const res = await fetch(`${API_URL}/get_workouts?${params}`, {
         method: 'GET',
         headers: { 'Authorization': token }
       });
@@ -193,8 +225,9 @@ document.addEventListener('DOMContentLoaded', () => {
         return;
       }
       const data = await res.json();
-      const workouts = Array.isArray(data.workouts) ? data.workouts : [];
-      renderWorkouts(workouts);
+      const workouts = decodeRows(data);
+      nextCursor = data.next_cursor || null;
+      renderWorkouts(workouts, Boolean(cursor));
     } catch(e){
       const hint = (location.protocol === 'file:')
         ? ' (Otevři stránku přes http://localhost:5000 — spusť run_web.ps1)'
@@ -203,16 +236,25 @@ document.addEventListener('DOMContentLoaded', () => {
     }
   }
 
-  function renderWorkouts(workouts){
+  // Sloupcová odpověď {columns, rows} -> pole objektů (starší formát {workouts} projde beze změny)
+  function decodeRows(data){
+    if (Array.isArray(data.columns) && Array.isArray(data.rows)){
+      return data.rows.map(row => Object.fromEntries(data.columns.map((c, i) => [c, row[i]])));
+    }
+    return Array.isArray(data.workouts) ? data.workouts : [];
+  }
+
+  function renderWorkouts(workouts, append){
     if (!workoutsList) return;
-    workoutsList.innerHTML = '';
-    if (!workouts || workouts.length === 0){
+    if (!append) workoutsList.innerHTML = '';
+    if (workoutsMore) workoutsMore.classList[nextCursor ? 'remove' : 'add']('hidden');
+    if (!append && (!workouts || workouts.length === 0)){
       workoutsEmpty && workoutsEmpty.classList.remove('hidden');
       return;
     }
     workoutsEmpty && workoutsEmpty.classList.add('hidden');
-    // zobrazíme posledních 5
-    workouts.slice(0,5).forEach(w => {
+    // stránka už je omezená na serveru, další se připojí tlačítkem "Načíst další"
+    workouts.forEach(w => {
       const item = document.createElement('div');
       item.className = 'workout-item';
       const head = document.createElement('div');
@@ -234,6 +276,101 @@ document.addEventListener('DOMContentLoaded', () => {
     });
   }
 
+  async function fetchAndRenderStats(){
+    const token = localStorage.getItem('amp_token');
+    if (!token || !statsList) return;
+    const generation = ++statsGeneration;
+    historyLoaded = false;
+    try {
+      // PR i progres spočítá server, historie se kvůli tomu nestahuje
+      const res = await fetch(`${API_URL}/stats/progress`, {
+        method: 'GET',
+        headers: { 'Authorization': token }
+      });
+      if (!res.ok) return;
+      const data = await res.json();
+      if (generation !== statsGeneration) return;
+      progress = data.progress || {};
+      lastSeenId = data.last_id || 0;
+      historyLoaded = true;
+      renderStats(progress);
+    } catch(e){
+      console.warn('Chyba při načítání statistik:', e);
+    }
+  }
+
+  async function syncStats(){
+    const token = localStorage.getItem('amp_token');
+    if (!token || !statsList || !historyLoaded) return;
+    const generation = statsGeneration;
+    try {
+      let changed = false;
+      let hasMore = true;
+      while (hasMore) {
+        const since = lastSeenId;
+        const res = await fetch(`${API_URL}/sync?since=${since}`, {
+          method: 'GET',
+          headers: { 'Authorization': token }
+        });
+        if (!res.ok) return;
+        const data = await res.json();
+        // mezitím proběhlo odhlášení, plné načtení nebo souběžný sync
+        if (generation !== statsGeneration || since !== lastSeenId) return;
+        data.workouts.forEach(w => mergeWorkout(progress, w));
+        changed = changed || data.workouts.length > 0;
+        lastSeenId = data.last_id;
+        hasMore = data.has_more;
+      }
+      if (changed) renderStats(progress);
+    } catch(e){
+      console.warn('Chyba při synchronizaci:', e);
+    }
+  }
+
+  // Stejná pravidla jako souhrn na serveru; nový záznam má vždy vyšší id
+  function mergeWorkout(progress, w){
+    const volume = w.sets * w.reps * w.weight;
+    const latest = { date: w.date, sets: w.sets, reps: w.reps, weight: w.weight, volume };
+    const p = progress[w.exercise];
+    if (!p) {
+      progress[w.exercise] = {
+        first_date: w.date, first_weight: w.weight, latest,
+        total_volume: volume, max_weight: w.weight, entries: 1
+      };
+      return;
+    }
+    p.total_volume += volume;
+    p.entries += 1;
+    p.max_weight = Math.max(p.max_weight, w.weight);
+    if (w.date < p.first_date) {
+      p.first_date = w.date;
+      p.first_weight = w.weight;
+    }
+    if (w.date >= p.latest.date) p.latest = latest;
+  }
+
+  function renderStats(progress){
+    statsList.innerHTML = '';
+    Object.entries(progress).forEach(([exercise, p]) => {
+      const diff = p.latest.weight - p.first_weight;
+      const arrow = diff > 0 ? '🔺' : diff < 0 ? '🔻' : '=';
+      const item = document.createElement('div');
+      item.className = 'workout-item';
+      const head = document.createElement('div');
+      head.className = 'workout-head';
+      const ex = document.createElement('div');
+      ex.className = 'workout-ex';
+      ex.textContent = `${exercise} — PR ${p.max_weight} kg`;
+      const meta = document.createElement('div');
+      meta.className = 'workout-meta';
+      meta.textContent = `Progres: ${Math.abs(diff)} kg ${arrow} · Celkový objem: ${p.total_volume} kg`;
+      head.appendChild(ex);
+      head.appendChild(meta);
+      item.appendChild(head);
+      statsList.appendChild(item);
+    });
+  }
+
   async function checkApi(){
     try {
       const res = await fetch(`${API_URL}/ping`, { method: 'GET' });